@@ -25,31 +25,148 @@ if sys.platform == 'darwin':
     except:
         pass
 
-# Now try to import tkinter with error handling
-try:
-    import tkinter as tk
-    from tkinter import ttk, filedialog, messagebox, scrolledtext
-    TKINTER_AVAILABLE = True
-except Exception as e:
-    print(f"Warning: Tkinter not available: {e}")
-    print("Falling back to command-line mode...")
-    TKINTER_AVAILABLE = False
+# Tkinter is imported by main() only: patch worker processes re-import this module
+# and have no use for Tk, which is slow to load on macOS
+TKINTER_AVAILABLE = False
+
+def import_tkinter():
+    """Import tkinter into the module namespace with error handling"""
+    global tk, ttk, filedialog, messagebox, scrolledtext, TKINTER_AVAILABLE
+    try:
+        import tkinter as tk
+        from tkinter import ttk, filedialog, messagebox, scrolledtext
+        TKINTER_AVAILABLE = True
+    except Exception as e:
+        print(f"Warning: Tkinter not available: {e}")
+        print("Falling back to command-line mode...")
+        TKINTER_AVAILABLE = False
+    return TKINTER_AVAILABLE
 
 import subprocess
 import tempfile
 import shutil
 import threading
 import time
+import mmap
+import concurrent.futures
+import codecs
+import functools
+import itertools
+import stat
+import hashlib
+from collections import Counter, deque
+import multiprocessing
+import queue
+import re
+import plistlib
+import importlib.metadata
+import importlib.util
 from pathlib import Path
-# Import pycdlib with error handling
-try:
-    import pycdlib
-    PYCDLIB_AVAILABLE = True
-except ImportError:
-    PYCDLIB_AVAILABLE = False
+# pycdlib is only imported by the first ISO operation (see _pycdlib); finding it is
+# enough to decide at startup whether the UI can run
+PYCDLIB_AVAILABLE = importlib.util.find_spec('pycdlib') is not None
+if not PYCDLIB_AVAILABLE:
     print("Warning: pycdlib not available. Install with: pip install pycdlib")
 
+@functools.cache
+def _pycdlib():
+    """Import pycdlib on first use"""
+    import pycdlib
+    return pycdlib
+
+# Buffer size used when streaming files out of an ISO. The default 8 KiB
+# buffers turn multi-GB WIM extraction into hundreds of thousands of syscalls.
+EXTRACT_BUFFER_SIZE = 1024 * 1024
+# Largest single write() issued from a memory-mapped ISO (macOS rejects writes over 2 GiB)
+MMAP_WRITE_CHUNK = 64 * 1024 * 1024
+# Log widget batching: queued lines are moved into the widget this often, at most this many per tick
+LOG_FLUSH_INTERVAL_MS = 50
+LOG_FLUSH_BATCH = 200
+# Scratch space is put in RAM only when at least this multiple of the data bound for it is free
+RAM_TEMPDIR_FACTOR = 2
+RAMDISK_VOLUME_NAME = "WinMacScratch"
+# Location of the registry hive holding the LabConfig bypass keys inside a WinPE image
+SYSTEM_HIVE_WIM_PATH = "/Windows/System32/config/SYSTEM"
+# pycdlib releases (major.minor) whose internals write_volume_label_in_place was checked against
+PYCDLIB_LABEL_WRITE_VERSIONS = ('1.22',)
+# How often the UI polls the patch worker process for log/progress messages
+WORKER_POLL_INTERVAL_MS = 100
+# How long the worker may take to exit after posting its result before it is terminated
+WORKER_EXIT_TIMEOUT_S = 10
+# The worker ships log lines to the UI in batches of up to this many per queue put
+WORKER_LOG_BATCH = 256
+# Parallel extraction: worker cap, writes in flight, and the tree size worth parallelizing
+EXTRACT_MAX_WORKERS = 8
+EXTRACT_MAX_PENDING = 32
+EXTRACT_PARALLEL_MIN_FILES = 8
+# Minimum seconds between "Added N files" progress lines while building an ISO
+PROGRESS_LOG_INTERVAL = 1.0
+# Mount point column of 'hdiutil attach' output (tab-separated, so names may contain spaces)
+HDIUTIL_MOUNT_POINT_RE = re.compile(r'(/Volumes/[^\t\n]+)')
+# Debug directory listings are only sorted up to this many entries per directory
+LISTING_SORT_LIMIT = 1024
+# bytes.translate() delete-table leaving only printable ASCII, for last-ditch filename guesses
+NONPRINTABLE_BYTES = bytes(b for b in range(256) if not 32 <= b <= 126)
+# Volume labels of the Windows 10 media Boot Camp Assistant is known to accept
+BOOTCAMP_VOLUME_IDS = frozenset({
+    'CCCOMA_X64FRE_EN-US_DV9',
+    'CCCOMA_X64FRE_EN-US_DV9%202',
+    'CCCOMA_X64FRE_EN-US_DV9%203',
+})
+
+@functools.cache
+def find_command(command):
+    """shutil.which() memoized per process; PATH doesn't change while the patcher runs"""
+    return shutil.which(command)
+
 class Win11BootCampPatcher:
+    # str.translate() delete-table for extracted filenames: ASCII control
+    # characters plus characters that are invalid in macOS/Windows paths
+    _BAD_FILENAME_CHARS = dict.fromkeys([*range(32), 127, *map(ord, '<>:"/\\|?*')])
+    # The same set as bytes, for the ASCII fast path (bytes.translate deletes in one C loop)
+    _BAD_FILENAME_BYTES = bytes(_BAD_FILENAME_CHARS)
+    # ISO branches minimal extraction leaves out (upper-cased path prefixes); Boot Camp
+    # only needs boot.wim, the boot loaders and the Setup files
+    _SKIP_PREFIXES = ('/SUPPORT/', '/UPGRADE/', '/BOOT/FONTS/', '/SOURCES/SXS/')
+    # hivexsh commands that add the LabConfig TPM/Secure Boot bypass values to a SYSTEM hive
+    _HIVEX_BYPASS_COMMANDS = (
+        "cd \\Setup",
+        "ls",  # List to see if LabConfig exists
+        "add LabConfig",  # This will fail if it exists, but that's OK
+        "cd LabConfig",
+        "setval 2",
+        "BypassTPMCheck",
+        "dword:1",
+        "BypassSecureBootCheck",
+        "dword:1",
+        "commit",
+        "quit",
+    )
+    # The same values for a hive that already has the LabConfig key
+    _HIVEX_UPDATE_COMMANDS = (
+        "cd \\Setup\\LabConfig",
+        "setval 2",
+        "BypassTPMCheck",
+        "dword:1",
+        "BypassSecureBootCheck",
+        "dword:1",
+        "commit",
+        "quit",
+    )
+    # Cleared the first time copy_file_range() is refused for ISO extraction
+    _kernel_copy_ok = True
+    # Validation reuses one pycdlib parse of the output ISO (see _open_iso)
+    _cached_iso = None
+    _cached_iso_key = None
+    _cached_iso_root = None
+    _cached_iso_files = None
+    _cached_iso_header = None
+    # Thread running the "Debug Boot Camp Issues" button's checks
+    _debug_thread = None
+    # Thread running the "Force Boot Camp Volume Label" button's update, and the dialog it leaves
+    _label_thread = None
+    _label_result = None
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Windows 11 to Windows 10 ISO Patcher for Boot Camp")
@@ -62,6 +179,19 @@ class Win11BootCampPatcher:
         self.output_iso_path = tk.StringVar()
         self.disable_validation = tk.BooleanVar(value=False)  # New validation disable flag
         self.is_processing = False
+        self._init_state()
+        
+        # Per-entry extraction logging (snapshot of the checkbox taken when patching starts)
+        self.verbose_extract_log = tk.BooleanVar(value=False)
+        
+        # Leave non-essential ISO branches out when the ISO has to be extracted and rebuilt
+        self.minimal_extract = tk.BooleanVar(value=False)
+        
+        # Have the Boot Camp debugger hash the whole output ISO (reads every byte)
+        self.debug_hash_iso = tk.BooleanVar(value=False)
+        
+        # Log messages may come from any thread; only the Tk main loop touches the widget
+        self._log_queue = queue.Queue()
         
         print("Setting up UI...")
         try:
@@ -70,11 +200,22 @@ class Win11BootCampPatcher:
         except Exception as e:
             print(f"Error setting up UI: {e}")
             raise
+        self.root.after(LOG_FLUSH_INTERVAL_MS, self._drain_log)
         
         # Check dependencies in a separate thread to avoid blocking UI
         print("Starting dependency check...")
         threading.Thread(target=self.check_dependencies, daemon=True).start()
     
+    def _init_state(self):
+        """Set up the patching state shared by the UI and PatchWorker (nothing Tk-related)"""
+        # Per-thread reusable transfer buffers for ISO extraction (avoids per-file allocations)
+        self._xfer_local = threading.local()
+        self._iso_mm = None  # Memory map of the ISO being extracted
+        self._ramdisks = {}  # RAM disks from _attach_ramdisk: mount point (device until mounted) -> device
+        self._extracted_boot_wim = None  # Local path of boot.wim after the last full extraction
+        self._verbose_extract = False  # Per-entry extraction logging, set when patching starts
+        self._minimal_extract = False  # Minimal extraction, set when patching starts
+    
     def setup_ui(self):
         """Setup the main UI components"""
         try:
@@ -119,6 +260,10 @@ class Win11BootCampPatcher:
             validation_frame.grid(row=5, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=5)
             ttk.Checkbutton(validation_frame, text="Disable validation (skip file checks)", 
                            variable=self.disable_validation).pack(side=tk.LEFT)
+            ttk.Checkbutton(validation_frame, text="Verbose extraction log (slower)", 
+                           variable=self.verbose_extract_log).pack(side=tk.LEFT, padx=(20, 0))
+            ttk.Checkbutton(validation_frame, text="Minimal extraction (faster)", 
+                           variable=self.minimal_extract).pack(side=tk.LEFT, padx=(20, 0))
             
             # Progress and log area
             log_frame = ttk.LabelFrame(main_frame, text="Progress and Log", padding="5")
@@ -141,6 +286,8 @@ class Win11BootCampPatcher:
             # Debug Boot Camp issues button
             debug_button = ttk.Button(button_frame, text="Debug Boot Camp Issues", command=self.debug_current_iso)
             debug_button.pack(side=tk.LEFT)
+            ttk.Checkbutton(button_frame, text="Include SHA-256 (slow)", 
+                           variable=self.debug_hash_iso).pack(side=tk.LEFT, padx=(10, 0))
             
             # Log text area - simplified creation
             try:
@@ -218,22 +365,43 @@ class Win11BootCampPatcher:
         """Add message to log"""
         try:
             timestamp = time.strftime("%H:%M:%S")
-            log_message = f"[{timestamp}] {message}\n"
+            log_message = f"[{timestamp}] {message}"
             
             if hasattr(self, 'log_text'):
-                self.log_text.insert(tk.END, log_message)
-                self.log_text.see(tk.END)
-                self.root.update_idletasks()
+                # Never touch Tk from here - log() is called from worker threads
+                self._log_queue.put(log_message)
             else:
-                print(log_message.strip())
+                print(log_message)
         except Exception as e:
             print(f"Error logging message: {e}")
             print(f"Original message: {message}")
     
+    def flush_log(self, limit=None):
+        """Write pending log lines to the log widget in one insert"""
+        try:
+            lines = []
+            while limit is None or len(lines) < limit:
+                try:
+                    lines.append(self._log_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            if lines:
+                self.log_text.insert(tk.END, '\n'.join(lines) + '\n')
+                self.log_text.see(tk.END)
+        except Exception as e:
+            print(f"Error flushing log: {e}")
+    
+    def _drain_log(self):
+        """Move queued log lines into the widget, rescheduling itself on the Tk main loop"""
+        self.flush_log(LOG_FLUSH_BATCH)
+        self.root.after(LOG_FLUSH_INTERVAL_MS, self._drain_log)
+    
     def clear_log(self):
         """Clear the log text area"""
         try:
             if hasattr(self, 'log_text'):
+                self.flush_log()
                 self.log_text.delete(1.0, tk.END)
         except Exception as e:
             print(f"Error clearing log: {e}")
@@ -242,6 +410,7 @@ class Win11BootCampPatcher:
         """Copy application logs to clipboard"""
         try:
             if hasattr(self, "log_text"):
+                self.flush_log()
                 logs = self.log_text.get(1.0, tk.END)
                 self.root.clipboard_clear()
                 self.root.clipboard_append(logs)
@@ -255,7 +424,6 @@ class Win11BootCampPatcher:
         """Update status bar"""
         try:
             self.status_var.set(status)
-            self.root.update_idletasks()
         except Exception as e:
             print(f"Error updating status: {e}")
     
@@ -264,22 +432,13 @@ class Win11BootCampPatcher:
         try:
             self.log("Checking dependencies...")
             
-            dependencies = {
-                'wimlib-imagex': 'wimlib-imagex --help',
-                'hivexsh': 'hivexsh --help'
-            }
-            
+            # A PATH lookup is enough to tell whether a tool is installed - no need
+            # to start each one with --help
             missing_deps = []
-            for dep, cmd in dependencies.items():
-                try:
-                    result = subprocess.run(cmd.split(), capture_output=True, timeout=10)
-                    if result.returncode == 0 or (dep == 'hivexsh' and result.returncode == 1):
-                        # hivexsh returns 1 for --help but that means it exists
-                        self.log(f"✓ {dep} found")
-                    else:
-                        self.log(f"✗ {dep} not found")
-                        missing_deps.append(dep)
-                except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
+            for dep in ['wimlib-imagex', 'hivexsh']:
+                if shutil.which(dep):
+                    self.log(f"✓ {dep} found")
+                else:
                     self.log(f"✗ {dep} not found")
                     missing_deps.append(dep)
             
@@ -334,10 +493,13 @@ class Win11BootCampPatcher:
         return True
     
     def start_patching(self):
-        """Start the patching process in a separate thread"""
+        """Start the patching process in a separate worker process"""
         if self.is_processing:
             return
         
+        if self._debug_iso_busy():
+            return
+        
         if not self.validate_inputs():
             return
         
@@ -345,17 +507,100 @@ class Win11BootCampPatcher:
         self.start_button.config(state='disabled', text='Patching...')
         self.progress.start()
         
-        # Run patching in separate thread to avoid blocking UI
-        thread = threading.Thread(target=self.patch_iso)
-        thread.daemon = True
-        thread.start()
+        config = {
+            'win11_iso': self.win11_iso_path.get(),
+            'win10_iso': self.win10_iso_path.get(),
+            'output_iso': self.output_iso_path.get(),
+            'disable_validation': self.disable_validation.get(),
+            'verbose_extract': self.verbose_extract_log.get(),
+            'minimal_extract': self.minimal_extract.get(),
+        }
+        
+        # Run patching in a separate process - pycdlib parsing and filename decoding
+        # hold the GIL, which starved the Tk main loop when run in a thread. Spawn rather
+        # than fork: forking a process that runs Tk and helper threads is unsafe
+        ctx = multiprocessing.get_context('spawn')
+        self._worker_log_queue = ctx.Queue()
+        self._worker_progress_queue = ctx.Queue()
+        self._patch_process = ctx.Process(
+            target=_do_patch, args=(config, self._worker_log_queue, self._worker_progress_queue), daemon=True)
+        self._patch_process.start()
+        self.root.after(WORKER_POLL_INTERVAL_MS, self._poll_patch_worker)
+    
+    def _drain_worker_log(self):
+        """Log every batch of lines the patch worker has sent so far"""
+        while True:
+            try:
+                lines = self._worker_log_queue.get_nowait()
+            except queue.Empty:
+                break
+            for line in lines:
+                self.log(line)
+    
+    def _poll_patch_worker(self):
+        """Forward log and progress messages from the patch worker to the UI"""
+        # Check liveness before draining so nothing queued before exit is missed
+        worker_alive = self._patch_process.is_alive()
+        
+        self._drain_worker_log()
+        
+        result = None
+        while True:
+            try:
+                kind, value = self._worker_progress_queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'status':
+                self.update_status(value)
+            else:
+                result = (kind, value)
+        
+        if result is None and worker_alive:
+            self.root.after(WORKER_POLL_INTERVAL_MS, self._poll_patch_worker)
+            return
+        
+        # The log and progress queues have separate feeder threads and pipes, so the
+        # last log batch can arrive after the result; keep reading it from the event
+        # loop until the worker has exited (which also keeps a full log pipe from
+        # blocking that exit)
+        self._worker_exit_deadline = time.monotonic() + WORKER_EXIT_TIMEOUT_S
+        self._await_patch_worker_exit(result)
     
-    def patch_iso(self):
-        """Main patching logic - WinPE injection approach"""
+    def _await_patch_worker_exit(self, result):
+        """Keep draining the worker log until the worker exits, then report the result"""
+        worker_alive = self._patch_process.is_alive()
+        self._drain_worker_log()
+        
+        if worker_alive:
+            if time.monotonic() < self._worker_exit_deadline:
+                self.root.after(WORKER_POLL_INTERVAL_MS, self._await_patch_worker_exit, result)
+                return
+            self.log(f"Warning: Patch worker did not exit within {WORKER_EXIT_TIMEOUT_S}s, terminating it")
+            self._patch_process.terminate()
+            self._patch_process.join(1)
+            self._drain_worker_log()
+        
+        self.is_processing = False
+        self.start_button.config(state='normal', text='Start Patching')
+        self.progress.stop()
+        
+        if result is None:
+            result = ('error', f"patch worker exited unexpectedly (exit code {self._patch_process.exitcode})")
+            self.log(f"✗ Error: {result[1]}")
+            self.update_status("WinPE injection failed!")
+        
+        kind, value = result
+        if kind == 'done':
+            messagebox.showinfo("Success", value)
+        else:
+            messagebox.showerror("Error", f"WinPE injection failed: {value}")
+    
+    def patch_iso(self, config):
+        """Main patching logic - WinPE injection approach. Returns the success message"""
         try:
-            win11_iso = self.win11_iso_path.get()
-            win10_iso = self.win10_iso_path.get()
-            output_iso = self.output_iso_path.get()
+            win11_iso = config['win11_iso']
+            win10_iso = config['win10_iso']
+            output_iso = config['output_iso']
             
             if not all([win11_iso, win10_iso, output_iso]):
                 raise Exception("Please select both input ISOs and output location")
@@ -365,58 +610,41 @@ class Win11BootCampPatcher:
             self.log(f"Windows 10 ISO: {win10_iso}")
             self.log(f"Output ISO: {output_iso}")
             
-            with tempfile.TemporaryDirectory() as temp_dir:
+            # Scratch normally holds just the Windows 10 boot.wim and its SYSTEM hive, so
+            # size the RAM-backed temp dir from that; a rebuild reserves its own
+            fast_dir = self._get_fast_tempdir(self.get_iso_file_size(win10_iso, '/sources/boot.wim'))
+            
+            with tempfile.TemporaryDirectory(dir=fast_dir) as temp_dir:
                 temp_path = Path(temp_dir)
                 
-                # Step 1: Extract Windows 10 ISO to get WinPE
-                self.update_status("Extracting Windows 10 ISO to get WinPE...")
-                self.log("Step 1: Extracting Windows 10 ISO to get WinPE...")
-                win10_extract_dir = temp_path / "win10_extract"
-                self.extract_iso_contents(win10_iso, win10_extract_dir)
-                
-                # Find Windows 10 boot.wim
-                win10_boot_wim = self.find_boot_wim(win10_extract_dir)
+                # Step 1: Extract only the Windows 10 WinPE (boot.wim) - nothing else is needed
+                self.update_status("Extracting Windows 10 WinPE...")
+                self.log("Step 1: Extracting Windows 10 boot.wim to get WinPE...")
+                win10_boot_wim = self.extract_single_file_from_iso(win10_iso, '/sources/boot.wim',
+                                                                   temp_path / "win10_winpe" / "boot.wim")
                 if not win10_boot_wim:
                     raise Exception("Could not find boot.wim in Windows 10 ISO")
                 self.log(f"✓ Found Windows 10 boot.wim at: {win10_boot_wim}")
                 
-                # Step 2: Extract Windows 11 ISO contents  
-                self.update_status("Extracting Windows 11 ISO contents...")
-                self.log("Step 2: Extracting Windows 11 ISO contents...")
-                win11_extract_dir = temp_path / "win11_extract" 
-                self.extract_iso_contents(win11_iso, win11_extract_dir)
-                
-                # Find Windows 11 boot.wim
-                win11_boot_wim = self.find_boot_wim(win11_extract_dir)
-                if not win11_boot_wim:
-                    raise Exception("Could not find boot.wim in Windows 11 ISO")
-                
-                # Step 3: Replace Windows 11 boot.wim with Windows 10 boot.wim
-                self.update_status("Injecting Windows 10 WinPE...")
-                self.log("Step 3: Replacing Windows 11 boot.wim with Windows 10 boot.wim...")
-                self.log(f"Replacing: {win11_boot_wim}")
-                self.log(f"With: {win10_boot_wim}")
-                shutil.copy2(win10_boot_wim, win11_boot_wim)
-                self.log("✓ Windows 10 WinPE injected successfully")
-                
-                # Step 4: Add TPM bypass to the injected Windows 10 WinPE
+                # Step 2: Add TPM bypass to the Windows 10 WinPE before it is injected
                 self.update_status("Adding TPM bypass to Windows 10 WinPE...")
-                self.log("Step 4: Adding TPM bypass registry entries to Windows 10 WinPE...")
-                self.add_tpm_bypass_to_boot_wim(win11_boot_wim, temp_path)
+                self.log("Step 2: Adding TPM bypass registry entries to Windows 10 WinPE...")
+                self.add_tpm_bypass_to_boot_wim(win10_boot_wim, temp_path)
                 
-                # Step 5: Extract Windows 10 metadata for Boot Camp compatibility
+                # Step 3: Extract Windows 10 metadata for Boot Camp compatibility
                 self.update_status("Extracting Windows 10 metadata...")
-                self.log("Step 5: Extracting Windows 10 metadata for Boot Camp compatibility...")
+                self.log("Step 3: Extracting Windows 10 metadata for Boot Camp compatibility...")
                 win10_metadata = self.extract_win10_metadata_from_iso(win10_iso)
                 
-                # Step 6: Create final ISO with Windows 10 branding
-                self.update_status("Creating Boot Camp compatible ISO...")
-                self.log("Step 6: Creating final ISO with Windows 10 branding...")
-                self.create_bootcamp_iso(win11_extract_dir, output_iso, win10_metadata)
+                # Step 4: Swap boot.wim inside a copy of the Windows 11 ISO - no re-mastering
+                self.update_status("Injecting Windows 10 WinPE...")
+                self.log("Step 4: Injecting Windows 10 WinPE into a copy of the Windows 11 ISO...")
+                if not self.patch_iso_in_place(win11_iso, win10_boot_wim, output_iso, win10_metadata):
+                    self.rebuild_iso_with_winpe(win11_iso, win10_boot_wim, output_iso, win10_metadata)
                 
-                # Step 7: Analyze and fix volume label for Boot Camp compatibility
+                # Step 5: Analyze and fix volume label for Boot Camp compatibility
                 self.update_status("Analyzing volume label for Boot Camp compatibility...")
-                self.log("Step 7: Analyzing volume label for Boot Camp compatibility...")
+                self.log("Step 5: Analyzing volume label for Boot Camp compatibility...")
                 current_volume_label = self.analyze_iso_volume_label(output_iso)
                 
                 if current_volume_label and not current_volume_label.startswith('CCCOMA_X64FRE_EN-US_DV9'):
@@ -437,7 +665,7 @@ class Win11BootCampPatcher:
                 self.log("   • TPM Bypass: Added to WinPE")
                 
                 # Run Boot Camp validation with enhanced debugging
-                if self.disable_validation.get():
+                if config['disable_validation']:
                     self.log("⚠️ Validation disabled by user - skipping file checks")
                     self.log("📝 Note: You can use the 'Debug Boot Camp Issues' button to manually check the ISO later")
                 else:
@@ -449,7 +677,7 @@ class Win11BootCampPatcher:
                 
                 # Show success dialog with troubleshooting info
                 validation_note = ""
-                if self.disable_validation.get():
+                if config['disable_validation']:
                     validation_note = "\nNote: Validation was disabled. Use the 'Debug Boot Camp Issues' button to manually check the ISO."
                 
                 success_msg = f"""Windows 11 ISO has been successfully patched for Boot Camp!
@@ -470,28 +698,294 @@ If Boot Camp still doesn't recognize the ISO:
 4. Verify the ISO file size and integrity
 5. Try mounting the ISO manually with hdiutil to test compatibility"""
                 
-                messagebox.showinfo("Success", success_msg)
+                return success_msg
                 
         except Exception as e:
             self.log(f"✗ Error: {str(e)}")
             self.update_status("WinPE injection failed!")
-            messagebox.showerror("Error", f"WinPE injection failed: {str(e)}")
+            raise
         
         finally:
-            self.is_processing = False
-            self.start_button.config(state='normal', text='Start Patching')
-            self.progress.stop()
+            self._detach_ramdisk()
+
+    def patch_iso_in_place(self, win11_iso, win10_boot_wim, output_iso, win10_metadata):
+        """Copy the Windows 11 ISO and overwrite its boot.wim in the copy.
+        
+        Returns False without leaving an output file when the new boot.wim needs
+        more blocks than the original, so the caller can rebuild the ISO instead.
+        """
+        try:
+            new_size = os.path.getsize(win10_boot_wim)
+            
+            iso = _pycdlib().PyCdlib()
+            iso.open(win11_iso)
+            try:
+                # Every namespace shares the file's data and modify_file_in_place() updates
+                # all linked records, so any one of them will do. Prefer the ISO 9660 record,
+                # but retail Windows ISOs are UDF bridge images whose ISO 9660 tree is only a
+                # README stub, so fall back to the UDF record there
+                path_kwargs = (self.find_file_in_iso(iso, '/sources/boot.wim', path_keys=['iso_path'])
+                               or self.find_file_in_iso(iso, '/sources/boot.wim', path_keys=['udf_path']))
+                if path_kwargs is None:
+                    self.log("In-place patch unavailable: boot.wim not found in ISO 9660 or UDF tree")
+                    return False
+                old_size = iso.get_record(**path_kwargs).get_data_length()
+                block_size = iso.logical_block_size
+                # Find out before copying anything whether the label can be written later
+                self.check_volume_label_writable(iso)
+            finally:
+                iso.close()
+            
+            capacity = -(-old_size // block_size) * block_size
+            if new_size > capacity:
+                self.log(f"In-place patch unavailable: Windows 10 boot.wim ({new_size:,} bytes) "
+                         f"exceeds the {capacity:,} bytes reserved for the original")
+                return False
+            
+            # Everything from the copy on runs in the cleanup scope, so a failed or short
+            # copy doesn't leave a partial ISO at the output path
+            try:
+                self.log(f"Copying Windows 11 ISO to: {output_iso}")
+                self._fast_copy(win11_iso, output_iso)
+                copied_size = os.path.getsize(output_iso)
+                if copied_size != os.path.getsize(win11_iso):
+                    raise OSError(f"short copy of the Windows 11 ISO ({copied_size:,} bytes written)")
+                
+                with open(win10_boot_wim, 'rb', buffering=EXTRACT_BUFFER_SIZE) as f:
+                    self.modify_file_in_place(output_iso, f, new_size, path_kwargs)
+                self.log(f"✓ Replaced boot.wim in place ({old_size:,} -> {new_size:,} bytes)")
+                
+                iso = _pycdlib().PyCdlib()
+                iso.open(output_iso, 'r+b')
+                try:
+                    self.write_volume_label_in_place(iso, win10_metadata.get('volume_id', 'CCCOMA_X64FRE_EN-US_DV9'))
+                finally:
+                    iso.close()
+            except Exception:
+                Path(output_iso).unlink(missing_ok=True)
+                raise
+            
+            self.log("✓ Windows 10 WinPE injected without rebuilding the ISO")
+            return True
+            
+        except Exception as e:
+            self.log(f"In-place patch failed, falling back to a full rebuild: {e}")
+            return False
+
+    def modify_file_in_place(self, iso_path, fp, length, path_kwargs):
+        """Overwrite a file's data inside an ISO without rebuilding it"""
+        if hasattr(_pycdlib(), 'InPlaceEditor'):
+            with _pycdlib().InPlaceEditor(iso_path) as editor:
+                editor.modify_file(fp, length, **path_kwargs)
+            return
+        
+        # pycdlib releases before InPlaceEditor only have the PyCdlib method it replaced
+        iso = _pycdlib().PyCdlib()
+        iso.open(iso_path, 'r+b')
+        try:
+            iso.modify_file_in_place(fp, length, **path_kwargs)
+        finally:
+            iso.close()
+
+    def check_volume_label_writable(self, iso):
+        """Raise unless this pycdlib has the internals write_volume_label_in_place relies on"""
+        try:
+            version = importlib.metadata.version('pycdlib')
+        except importlib.metadata.PackageNotFoundError:
+            version = 'unknown'
+        if version.rsplit('.', 1)[0] not in PYCDLIB_LABEL_WRITE_VERSIONS:
+            raise RuntimeError(f"in-place label writes are not verified for pycdlib {version}")
+        if not (hasattr(iso, '_seek_to_extent') and hasattr(iso, '_cdfp')
+                and hasattr(getattr(_pycdlib(), 'udf', None), '_ostaunicode_zero_pad')):
+            raise RuntimeError(f"pycdlib {version} lacks the internals needed for in-place label writes")
+
+    def write_volume_label_in_place(self, iso, volume_label):
+        """Rewrite the ISO 9660, Joliet and UDF volume identifiers of an ISO opened read-write"""
+        # pycdlib has no public API for rewriting volume descriptors, so this goes through
+        # its internals; refuse untested versions before touching the image so callers
+        # fall back to a rebuild
+        self.check_volume_label_writable(iso)
+        
+        iso.pvd.volume_identifier = volume_label[:32].ljust(32).encode('ascii')
+        iso._seek_to_extent(iso.pvd.extent_location())
+        iso._cdfp.write(iso.pvd.record())
+        
+        if iso.joliet_vd is not None:
+            # Joliet stores UCS-2, so only 16 characters fit
+            iso.joliet_vd.volume_identifier = volume_label[:16].ljust(16).encode('utf-16_be')
+            iso._seek_to_extent(iso.joliet_vd.extent_location())
+            iso._cdfp.write(iso.joliet_vd.record())
+        
+        if iso.has_udf():
+            # macOS mounts Windows ISOs from UDF, so the UDF Primary and Logical Volume
+            # Descriptors (main and reserve sequences) carry the label too; record()
+            # redoes their tag checksums and CRCs
+            for descs in (iso.udf_main_descs, iso.udf_reserve_descs):
+                for pvd in descs.pvds:
+                    pvd.vol_ident = _pycdlib().udf._ostaunicode_zero_pad(volume_label[:30], 32)
+                    iso._seek_to_extent(pvd.extent_location())
+                    iso._cdfp.write(pvd.record())
+                for lvd in descs.logical_volumes:
+                    lvd.logical_vol_ident = _pycdlib().udf._ostaunicode_zero_pad(volume_label, 128)
+                    iso._seek_to_extent(lvd.extent_location())
+                    iso._cdfp.write(lvd.record())
+        
+        self.log(f"✓ Volume label set to: {volume_label}")
+
+    def rebuild_iso_with_winpe(self, win11_iso, win10_boot_wim, output_iso, win10_metadata):
+        """Extract the Windows 11 ISO, swap in the Windows 10 boot.wim and master a new ISO"""
+        # Only this fallback puts the whole Windows 11 tree in scratch space, so it
+        # reserves room for that itself and gives a RAM disk back as soon as it's done
+        fast_dir = self._get_fast_tempdir(os.path.getsize(win11_iso))
+        try:
+            with tempfile.TemporaryDirectory(dir=fast_dir) as temp_dir:
+                self.update_status("Extracting Windows 11 ISO contents...")
+                self.log("Extracting Windows 11 ISO contents...")
+                win11_extract_dir = Path(temp_dir) / "win11_extract"
+                self.extract_iso_contents(win11_iso, win11_extract_dir)
+                
+                # Find Windows 11 boot.wim - extraction already knows where it put it
+                win11_boot_wim = self._extracted_boot_wim
+                if win11_boot_wim is None or not win11_boot_wim.is_file():
+                    win11_boot_wim = self.find_boot_wim(win11_extract_dir)
+                if not win11_boot_wim:
+                    raise Exception("Could not find boot.wim in Windows 11 ISO")
+                
+                self.log("Replacing Windows 11 boot.wim with Windows 10 boot.wim...")
+                self.log(f"Replacing: {win11_boot_wim}")
+                self.log(f"With: {win10_boot_wim}")
+                self._fast_copy(win10_boot_wim, win11_boot_wim)
+                self.log("✓ Windows 10 WinPE injected successfully")
+                
+                self.update_status("Creating Boot Camp compatible ISO...")
+                self.log("Creating final ISO with Windows 10 branding...")
+                self.create_bootcamp_iso(win11_extract_dir, output_iso, win10_metadata)
+        finally:
+            if fast_dir:
+                self._detach_ramdisk(fast_dir)
+
+    def _fast_copy(self, src, dst):
+        """Copy file data in kernel space where the platform allows it.
+        
+        Metadata isn't preserved - the copy is re-packed into a new ISO anyway.
+        """
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            try:
+                if hasattr(os, 'copy_file_range'):
+                    # Linux: the data never bounces through user space
+                    while os.copy_file_range(fsrc.fileno(), fdst.fileno(), 1 << 30):
+                        pass
+                    return
+                if sys.platform == 'darwin' and hasattr(shutil, '_fastcopy_fcopyfile'):
+                    # macOS: fcopyfile() without the metadata pass copy2 adds
+                    import posix
+                    shutil._fastcopy_fcopyfile(fsrc, fdst, posix._COPYFILE_DATA)
+                    return
+            except Exception:
+                # Kernel copy unsupported here (e.g. across filesystems) - start over
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+            
+            shutil.copyfileobj(fsrc, fdst, EXTRACT_BUFFER_SIZE)
+
+    def _get_fast_tempdir(self, data_size):
+        """Return a RAM-backed directory for data_size bytes of scratch files, or None to use the default temp dir"""
+        if data_size is None:
+            return None
+        needed = RAM_TEMPDIR_FACTOR * data_size
+        try:
+            if sys.platform.startswith('linux') and os.path.isdir('/dev/shm'):
+                if shutil.disk_usage('/dev/shm').free > needed:
+                    self.log("Using /dev/shm for temporary files")
+                    return '/dev/shm'
+            elif sys.platform == 'darwin':
+                available = self._available_memory()
+                if available is not None and available > needed:
+                    return self._attach_ramdisk(needed)
+        except Exception as e:
+            self.log(f"Warning: RAM-backed temp directory unavailable: {e}")
+        return None
+
+    def _available_memory(self):
+        """Return free physical memory in bytes, or None if it can't be determined"""
+        try:
+            return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+        except (ValueError, OSError, AttributeError):
+            pass
+        
+        # macOS has no SC_AVPHYS_PAGES; free + inactive pages can be handed to a RAM disk
+        try:
+            result = subprocess.run(['vm_stat'], capture_output=True, text=True, timeout=10)
+            if result.returncode != 0:
+                return None
+            lines = result.stdout.splitlines()
+            page_size = int(lines[0].split('page size of')[1].split()[0])
+            pages = 0
+            for line in lines[1:]:
+                name, _, value = line.partition(':')
+                if name in ('Pages free', 'Pages inactive', 'Pages speculative'):
+                    pages += int(value.strip().rstrip('.'))
+            return pages * page_size
+        except (FileNotFoundError, subprocess.TimeoutExpired, IndexError, ValueError):
+            return None
+
+    def _attach_ramdisk(self, size):
+        """Create and mount an HFS+ RAM disk of at least size bytes; returns its mount point"""
+        sectors = -(-size // 512)
+        result = subprocess.run(['hdiutil', 'attach', '-nomount', f'ram://{sectors}'],
+                                capture_output=True, text=True, timeout=60)
+        if result.returncode != 0:
+            raise Exception(f"hdiutil attach failed: {result.stderr.strip()}")
+        device = result.stdout.strip()
+        self._ramdisks[device] = device
+        
+        result = subprocess.run(['diskutil', 'erasevolume', 'HFS+', RAMDISK_VOLUME_NAME, device],
+                                capture_output=True, text=True, timeout=120)
+        if result.returncode != 0:
+            self._detach_ramdisk(device)
+            raise Exception(f"diskutil erasevolume failed: {result.stderr.strip()}")
+        
+        # The volume is renamed if one with the same name is already mounted
+        result = subprocess.run(['diskutil', 'info', '-plist', device],
+                                capture_output=True, timeout=30)
+        mount_point = plistlib.loads(result.stdout).get('MountPoint') if result.returncode == 0 else None
+        if not mount_point:
+            self._detach_ramdisk(device)
+            raise Exception("could not determine RAM disk mount point")
+        
+        del self._ramdisks[device]
+        self._ramdisks[mount_point] = device
+        self.log(f"Using {size // (1024 * 1024)} MB RAM disk at {mount_point} for temporary files")
+        return mount_point
+
+    def _detach_ramdisk(self, mount_point=None):
+        """Eject the RAM disk _attach_ramdisk mounted at mount_point, or every one it created"""
+        for key in ([mount_point] if mount_point is not None else list(self._ramdisks)):
+            device = self._ramdisks.pop(key, None)
+            if device:
+                self._eject_ramdisk(device)
+
+    def _eject_ramdisk(self, device):
+        """Detach one RAM disk device, logging rather than raising on failure"""
+        try:
+            result = subprocess.run(['hdiutil', 'detach', device, '-force'],
+                                    capture_output=True, text=True, timeout=60)
+            if result.returncode != 0:
+                self.log(f"⚠️ Warning: Could not detach RAM disk {device}: {result.stderr.strip()}")
+        except Exception as e:
+            self.log(f"⚠️ Warning: Could not detach RAM disk {device}: {e}")
 
     def extract_iso_contents(self, iso_path, extract_dir):
         """Extract ISO contents with UDF/Joliet/ISO9660 fallback and proper filename handling"""
         self.log("Extracting ISO: {}".format(Path(iso_path).name))
         
-        iso = pycdlib.PyCdlib()
+        iso = _pycdlib().PyCdlib()
         iso.open(iso_path)
         
         # Get ISO information
         try:
-            volume_id = iso.pvd.volume_identifier.decode('utf-8').strip()
+            volume_id = iso.pvd.volume_identifier.decode('ascii', errors='replace').rstrip()
             self.log(f"ISO Volume ID: '{volume_id}'")
         except:
             self.log("ISO Volume ID: Could not decode")
@@ -509,24 +1003,243 @@ If Boot Camp still doesn't recognize the ISO:
         
         self.log("Extracting files...")
         
-        # Try UDF first if available
-        if hasattr(iso, 'udf_anchors') and iso.udf_anchors:
-            self.log("UDF extension detected")
-            if self.extract_udf_contents(iso, extract_dir):
+        self._extracted_boot_wim = None
+        
+        # Map the whole ISO once so file data can be copied straight out of the page cache
+        self.map_iso(iso_path)
+        self._advise_sequential(iso)
+        try:
+            path_key = None
+            
+            # Try UDF first if available
+            if hasattr(iso, 'udf_anchors') and iso.udf_anchors:
+                self.log("UDF extension detected")
+                if self.extract_udf_contents(iso, extract_dir):
+                    path_key = 'udf_path'
+            
+            # Try Joliet if available
+            if path_key is None and iso.joliet_vd:
+                self.log("Joliet extension detected")
+                if self.extract_joliet_contents(iso, extract_dir):
+                    path_key = 'joliet_path'
+            
+            # Fallback to ISO 9660
+            if path_key is None:
+                self.log("Using ISO 9660 extraction")
+                self.extract_iso9660_contents(iso, extract_dir)
+                path_key = 'iso_path'
+            
+            # Note where boot.wim was written while the ISO is still open, so callers
+            # don't have to search the extracted tree for it
+            boot_wim = self.find_file_in_iso(iso, '/sources/boot.wim', path_keys=[path_key])
+            if boot_wim:
+                self._extracted_boot_wim = extract_dir / boot_wim[path_key].lstrip('/')
+        finally:
+            self.unmap_iso()
+            iso.close()
+
+    def map_iso(self, iso_path):
+        """Memory-map the source ISO read-only for extent copies"""
+        self.unmap_iso()
+        fd = os.open(iso_path, os.O_RDONLY)
+        try:
+            self._iso_mm = mmap.mmap(fd, 0, prot=mmap.PROT_READ)
+        except (OSError, ValueError) as e:
+            self.log(f"Could not memory-map ISO, using buffered reads: {e}")
+            return
+        finally:
+            os.close(fd)  # The mapping keeps its own reference
+        
+        if hasattr(self._iso_mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+            try:
+                self._iso_mm.madvise(mmap.MADV_SEQUENTIAL)
+            except OSError:
+                pass
+
+    def _advise_sequential(self, iso):
+        """Tell the kernel pycdlib's ISO handle is read front to back (bigger readahead)"""
+        # Extents are copied off this descriptor by copy_file_range()/pread(), which the
+        # madvise() on the mapping doesn't cover
+        if hasattr(os, 'posix_fadvise') and hasattr(os, 'POSIX_FADV_SEQUENTIAL'):
+            try:
+                os.posix_fadvise(iso._cdfp.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            except (AttributeError, OSError):
+                pass
+
+    def unmap_iso(self):
+        """Release the ISO memory map, if any"""
+        if self._iso_mm is not None:
+            self._iso_mm.close()
+            self._iso_mm = None
+
+    def create_extract_dirs(self, dirs_needed):
+        """Create the directories gathered while walking the ISO, parents first"""
+        dirs_created = 0
+        # Shallowest first, so each mkdir only ever creates a single directory
+        for local_path in sorted(dirs_needed, key=lambda p: len(p.parts)):
+            try:
+                local_path.mkdir(exist_ok=True)
+                dirs_created += 1
+            except Exception as e:
+                self.log(f"Warning: Failed to create directory {local_path.name}: {e}")
+        return dirs_created
+
+    def extract_file_tasks(self, iso, file_tasks):
+        """Write out the files collected while walking the ISO directory tree"""
+        files_extracted = 0
+        
+        # Resolve extents up front on this thread - pycdlib objects aren't thread-safe
+        copy_tasks = []
+        for path_kwargs, local_path, record in file_tasks:
+            try:
+                # The walk already has each record in hand, so skip the per-file path lookup
+                extents = self._record_extents(iso, record)
+                if extents is None:
+                    extents = self._resolve_file_extents(iso, path_kwargs)
+                if extents is not None:
+                    copy_tasks.append((extents, local_path))
+                    continue
+                self.extract_file_from_iso(iso, local_path, **path_kwargs)
+                files_extracted += 1
+            except Exception as e:
+                self.log(f"Warning: Failed to extract {local_path.name}: {e}")
+        
+        if not copy_tasks:
+            return files_extracted
+        src_fd = iso._cdfp.fileno()
+        
+        # Small trees aren't worth the thread start-up cost
+        if len(copy_tasks) < EXTRACT_PARALLEL_MIN_FILES:
+            for extents, local_path in copy_tasks:
+                try:
+                    self._write_extents(src_fd, extents, local_path)
+                    files_extracted += 1
+                    if files_extracted % 100 == 0:
+                        self.log(f"Extracted {files_extracted} files so far...")
+                except Exception as e:
+                    self.log(f"Warning: Failed to extract {local_path.name}: {e}")
+            return files_extracted
+        
+        # Overlap the writes; they block in the kernel so the GIL isn't a bottleneck
+        max_workers = min(EXTRACT_MAX_WORKERS, os.cpu_count() or 1)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            pending = {}
+            
+            def collect(done):
+                nonlocal files_extracted
+                for future in done:
+                    local_path = pending.pop(future)
+                    try:
+                        future.result()
+                        files_extracted += 1
+                        if files_extracted % 100 == 0:
+                            self.log(f"Extracted {files_extracted} files so far...")
+                    except Exception as e:
+                        self.log(f"Warning: Failed to extract {local_path.name}: {e}")
+            
+            for extents, local_path in copy_tasks:
+                # Keep a bounded number of writes in flight
+                if len(pending) >= EXTRACT_MAX_PENDING:
+                    done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    collect(done)
+                pending[pool.submit(self._write_extents, src_fd, extents, local_path)] = local_path
+            
+            done, _ = concurrent.futures.wait(pending)
+            collect(done)
+        
+        return files_extracted
+
+    def get_iso_file_size(self, iso_path, iso_internal_path):
+        """Size in bytes of a file inside an ISO, or None if it can't be found"""
+        try:
+            iso = _pycdlib().PyCdlib()
+            iso.open(iso_path)
+            try:
+                path_kwargs = self.find_file_in_iso(iso, iso_internal_path)
+                if path_kwargs is None:
+                    return None
+                return iso.get_record(**path_kwargs).get_data_length()
+            finally:
                 iso.close()
-                return
+        except Exception as e:
+            self.log(f"Warning: Could not size {iso_internal_path} in {Path(iso_path).name}: {e}")
+            return None
+
+    def extract_single_file_from_iso(self, iso_path, iso_internal_path, out_path):
+        """Extract a single file from an ISO without unpacking the rest of it"""
+        self.log(f"Extracting {iso_internal_path} from: {Path(iso_path).name}")
         
-        # Try Joliet if available
+        iso = _pycdlib().PyCdlib()
+        iso.open(iso_path)
+        try:
+            self.map_iso(iso_path)
+            self._advise_sequential(iso)
+            path_kwargs = self.find_file_in_iso(iso, iso_internal_path)
+            if path_kwargs is None:
+                self.log(f"✗ {iso_internal_path} not found in ISO")
+                return None
+            
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            self.extract_file_from_iso(iso, out_path, **path_kwargs)
+            self.log(f"✓ Extracted {iso_internal_path} ({out_path.stat().st_size:,} bytes)")
+            return out_path
+        finally:
+            self.unmap_iso()
+            iso.close()
+
+    def find_file_in_iso(self, iso, iso_internal_path, path_keys=None):
+        """Resolve a path such as /sources/boot.wim case-insensitively.
+        
+        Returns the pycdlib path keyword (udf_path/joliet_path/iso_path) for the
+        first namespace that contains the file, or None. path_keys limits the search.
+        """
+        wanted = [part.lower() for part in iso_internal_path.strip('/').split('/')]
+        
+        namespaces = []
+        if hasattr(iso, 'udf_anchors') and iso.udf_anchors:
+            namespaces.append('udf_path')
         if iso.joliet_vd:
-            self.log("Joliet extension detected")
-            if self.extract_joliet_contents(iso, extract_dir):
-                iso.close()
-                return
+            namespaces.append('joliet_path')
+        namespaces.append('iso_path')
+        if path_keys is not None:
+            namespaces = [key for key in namespaces if key in path_keys]
         
-        # Fallback to ISO 9660
-        self.log("Using ISO 9660 extraction")
-        self.extract_iso9660_contents(iso, extract_dir)
-        iso.close()
+        for path_key in namespaces:
+            current = ''
+            try:
+                for part in wanted:
+                    for child in iso.list_children(**{path_key: current or '/'}):
+                        if child is None or child.is_dot() or child.is_dotdot():
+                            continue
+                        name = self.iso_record_name(child, path_key)
+                        display_name = name
+                        if path_key == 'iso_path':
+                            display_name = name.split(';')[0].rstrip('.')
+                        if display_name.lower() == part:
+                            current += '/' + name
+                            break
+                    else:
+                        current = None
+                        break
+                if current:
+                    return {path_key: current}
+            except Exception as e:
+                self.log(f"Warning: Could not search {path_key.split('_')[0]} namespace: {e}")
+        
+        return None
+
+    def iso_record_name(self, child, path_key):
+        """Decode a pycdlib record's name for the given namespace"""
+        name = child.file_identifier()
+        if isinstance(name, bytes):
+            if path_key == 'joliet_path':
+                encoding = 'utf-16_be'
+            elif path_key == 'udf_path' and getattr(child, 'file_ident', None) is not None:
+                encoding = child.file_ident.encoding
+            else:
+                encoding = 'utf-8'
+            name = name.decode(encoding, errors='ignore')
+        return name
 
     def extract_udf_contents(self, iso, extract_dir):
         """Extract UDF contents with proper filename decoding"""
@@ -534,107 +1247,88 @@ If Boot Camp still doesn't recognize the ISO:
             self.log("Trying UDF extraction...")
             self.log(f"UDF anchors found: {len(iso.udf_anchors)}")
             
-            files_extracted = 0
-            dirs_created = 0
+            file_tasks = []
             
             # Use deque for iterative directory traversal
-            from collections import deque
             dirs_to_process = deque(['/'])
+            # Gather the tree during the walk and create it in one pass before any writes
+            dirs_needed = set()
+            name_getter = None
             
             while dirs_to_process:
                 current_dir = dirs_to_process.popleft()
-                children_list = list(iso.list_children(udf_path=current_dir))
-                self.log(f"Processing {current_dir}: found {len(children_list)} entries")
+                # Stream the listing rather than materializing it - directories can hold thousands of entries
+                if self._verbose_extract:
+                    self.log(f"Processing {current_dir}")
+                entry_count = 0
+                # Names already used in this directory; truncated fallback names can repeat
+                names_in_dir = set()
                 
-                for i, child in enumerate(children_list):
+                for i, child in enumerate(iso.list_children(udf_path=current_dir), start=1):
+                    entry_count += 1
                     try:
-                        # Try different methods to get filename from UDF entry
-                        filename = None
-                        
-                        # Method 1: Try file_identifier() if it exists
-                        if hasattr(child, 'file_identifier'):
-                            try:
-                                filename = child.file_identifier()
-                                if isinstance(filename, bytes):
-                                    filename = filename.decode('utf-8', errors='ignore').strip()
-                            except:
-                                pass
-                        
-                        # Method 2: Try accessing UDF file info directly
-                        if not filename and hasattr(child, 'fi') and hasattr(child.fi, 'fi_ident'):
-                            try:
-                                raw_name_bytes = child.fi.fi_ident
-                                filename = self.decode_udf_filename(raw_name_bytes)
-                            except:
-                                pass
-                        
-                        # Method 3: Try the identifier attribute directly
-                        if not filename and hasattr(child, 'identifier'):
-                            try:
-                                if isinstance(child.identifier, bytes):
-                                    filename = child.identifier.decode('utf-8', errors='ignore').strip()
-                                else:
-                                    filename = str(child.identifier)
-                            except:
-                                pass
+                        # Work out which name accessor this pycdlib version supports once,
+                        # rather than probing every entry
+                        if name_getter is None:
+                            name_getter = self.resolve_udf_name_getter(child)
                         
-                        # Method 4: Try directory_record.identifier if it's a directory record
-                        if not filename and hasattr(child, 'directory_record') and hasattr(child.directory_record, 'identifier'):
+                        filename = None
+                        if name_getter is not None:
                             try:
-                                if isinstance(child.directory_record.identifier, bytes):
-                                    filename = child.directory_record.identifier.decode('utf-8', errors='ignore').strip()
-                                else:
-                                    filename = str(child.directory_record.identifier)
-                            except:
+                                filename = name_getter(child)
+                            except Exception:
                                 pass
                         
-                        # Clean up filename - remove any remaining null characters and ensure it's safe
+                        # Clean up filename - remove control and filesystem-reserved characters
                         if filename:
-                            # Remove null characters and other problematic characters
-                            filename = filename.replace('\x00', '').replace('\n', '').replace('\r', '').strip()
-                            # Ensure filename is valid for filesystem
-                            filename = ''.join(c for c in filename if c.isprintable() and c not in '<>:"/\\|?*')
+                            if filename.isascii():
+                                # Everything left after the delete is printable ASCII
+                                filename = filename.encode('ascii').translate(None, self._BAD_FILENAME_BYTES).decode('ascii').strip()
+                            else:
+                                filename = filename.translate(self._BAD_FILENAME_CHARS).strip()
+                                # Rare non-ASCII non-printables aren't in the table
+                                if not filename.isprintable():
+                                    filename = ''.join(c for c in filename if c.isprintable())
                         
                         if not filename or filename in ['.', '..', '']:
-                            self.log(f"  Entry {i+1}: Skipping entry with no valid filename")
+                            if self._verbose_extract:
+                                self.log(f"  Entry {i}: Skipping entry with no valid filename")
                             continue
+                        
+                        if filename in names_in_dir:
+                            base_name, suffix = filename, 1
+                            while filename in names_in_dir:
+                                filename = f"{base_name}_{suffix}"
+                                suffix += 1
+                        names_in_dir.add(filename)
                             
-                        self.log(f"  Entry {i+1}: {filename} ({'DIR' if child.is_dir() else 'FILE'})")
+                        if self._verbose_extract:
+                            self.log(f"  Entry {i}: {filename} ({'DIR' if child.is_dir() else 'FILE'})")
                         
                         # Create full paths
                         relative_path = current_dir.rstrip('/') + '/' + filename if current_dir != '/' else filename
                         local_path = extract_dir / relative_path.lstrip('/')
                         
+                        if self._minimal_extract and self.is_nonessential_path(relative_path, child.is_dir()):
+                            if self._verbose_extract:
+                                self.log(f"  Entry {i}: Skipping non-essential {relative_path}")
+                            continue
+                        
                         if child.is_dir():
-                            try:
-                                local_path.mkdir(parents=True, exist_ok=True)
-                                self.log(f"Created directory: {filename}")
-                                dirs_to_process.append('/' + relative_path.lstrip('/') + '/')
-                                dirs_created += 1
-                            except Exception as e:
-                                self.log(f"Warning: Failed to create directory {filename}: {e}")
-                                continue
+                            dirs_needed.add(local_path)
+                            dirs_to_process.append('/' + relative_path.lstrip('/') + '/')
                         else:
-                            try:
-                                # Ensure parent directory exists
-                                local_path.parent.mkdir(parents=True, exist_ok=True)
-                                
-                                # Extract file
-                                with open(local_path, 'wb') as f:
-                                    iso.get_file_from_iso_fp(f, udf_path='/' + relative_path.lstrip('/'))
-                                
-                                files_extracted += 1
-                                if files_extracted % 100 == 0:
-                                    self.log(f"Extracted {files_extracted} files so far...")
-                                    
-                            except Exception as e:
-                                self.log(f"Warning: Failed to extract {filename}: {e}")
-                                continue
+                            file_tasks.append(({'udf_path': '/' + relative_path.lstrip('/')}, local_path, child))
                                 
                     except Exception as e:
                         self.log(f"Warning: Error processing UDF entry {i}: {e}")
                         continue
+                
+                if self._verbose_extract:
+                    self.log(f"Processed {current_dir}: {entry_count} entries")
             
+            dirs_created = self.create_extract_dirs(dirs_needed)
+            files_extracted = self.extract_file_tasks(iso, file_tasks)
             self.log(f"Extraction summary: {files_extracted} files, {dirs_created} directories")
             
             if files_extracted > 0:
@@ -649,107 +1343,274 @@ If Boot Camp still doesn't recognize the ISO:
             self.log(f"UDF extraction error: {e}")
             return False
 
-    def decode_udf_filename(self, raw_bytes):
-        """Decode UDF filename bytes with multiple strategies"""
-        if not raw_bytes:
-            return ""
+    def is_nonessential_path(self, relative_path, is_dir):
+        """Check whether an ISO path lies in a branch minimal extraction skips"""
+        path = '/' + relative_path.lstrip('/').upper()
+        if is_dir:
+            path += '/'
+        return path.startswith(self._SKIP_PREFIXES)
+
+    def extract_file_from_iso(self, iso, local_path, **path_kwargs):
+        """Extract a single file from the ISO, copying its extents directly when possible"""
+        if self._fast_extract(iso, path_kwargs, local_path):
+            return
         
-        # Strategy 1: UTF-16LE decoding (most common for UDF)
+        # Fallback: stream through pycdlib with a large write buffer (files under the
+        # buffer size reach the disk in a single write)
+        with open(local_path, 'wb', buffering=EXTRACT_BUFFER_SIZE) as f:
+            try:
+                self._preallocate(f.fileno(), iso.get_record(**path_kwargs).get_data_length())
+            except Exception:
+                pass  # Size unknown - just stream
+            iso.get_file_from_iso_fp(f, blocksize=EXTRACT_BUFFER_SIZE, **path_kwargs)
+
+    def _fast_extract(self, iso, iso_path_kwargs, local_path):
+        """Copy a file's byte extents from the ISO into a preallocated output file.
+        
+        Returns False when the extents can't be resolved so the caller can fall
+        back to pycdlib streaming.
+        """
+        extents = self._resolve_file_extents(iso, iso_path_kwargs)
+        if extents is None:
+            return False
+        self._write_extents(iso._cdfp.fileno(), extents, local_path)
+        return True
+
+    def _resolve_file_extents(self, iso, iso_path_kwargs):
+        """Return a file's (byte_offset, length) runs in the ISO, or None if unavailable
+        (older pycdlib, in-memory ISO, inline UDF data)"""
         try:
-            # UDF often uses UTF-16LE with null bytes
-            decoded = raw_bytes.decode('utf-16le', errors='ignore')
-            # Remove any remaining null characters and strip whitespace
-            decoded = decoded.replace('\x00', '').strip()
-            if decoded and decoded not in ['.', '..']:
-                return decoded
-        except:
-            pass
-        
-        # Strategy 2: UTF-16BE decoding
+            extents = iso.get_file_byte_extents(**iso_path_kwargs)
+            iso._cdfp.fileno()
+            if 'udf_path' in iso_path_kwargs:
+                length = sum(size for _, size in extents)
+                if length != iso.get_record(**iso_path_kwargs).get_data_length():
+                    return None
+            return extents
+        except (AttributeError, OSError, ValueError):
+            return None
+
+    def _record_extents(self, iso, record):
+        """Compute a file's (byte_offset, length) runs directly from its UDF file entry or
+        ISO9660/Joliet directory record, or None if unavailable"""
         try:
-            decoded = raw_bytes.decode('utf-16be', errors='ignore')
-            decoded = decoded.replace('\x00', '').strip()
-            if decoded and decoded not in ['.', '..']:
-                return decoded
-        except:
-            pass
-        
-        # Strategy 3: Manual UTF-16LE with byte manipulation
+            iso._cdfp.fileno()
+            block_size = iso.logical_block_size
+            
+            if hasattr(record, 'alloc_descs'):
+                part_start = iso.udf_main_descs.partitions[0].part_start_location
+                extents = [((part_start + desc.log_block_num) * block_size + desc.offset, desc.extent_length)
+                           for desc in record.alloc_descs]
+                # Data embedded in the file entry itself has no allocation descriptors
+                if sum(size for _, size in extents) != record.get_data_length():
+                    return None
+                return extents
+            
+            # Files over 4 GiB are chained across several directory records
+            extents = []
+            while record is not None and record.inode is not None and record.data_length:
+                extents.append(((record.inode.extent_location() + record.data_extent_offset) * block_size,
+                                record.data_length))
+                record = record.data_continuation
+            return extents
+        except (AttributeError, OSError, ValueError, IndexError):
+            return None
+
+    def _write_extents(self, src_fd, extents, local_path):
+        """Copy byte extents of the ISO into a new file. Safe to call from worker threads."""
+        length = sum(size for _, size in extents)
+        fd = os.open(local_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
         try:
-            # Sometimes UDF has a leading byte we need to skip
-            test_bytes = raw_bytes
-            if len(raw_bytes) > 1 and raw_bytes[0] == 0:
-                test_bytes = raw_bytes[1:]
-            
-            # Try decoding as UTF-16LE
-            if len(test_bytes) % 2 == 0:
-                decoded = test_bytes.decode('utf-16le', errors='ignore')
-                decoded = decoded.replace('\x00', '').strip()
-                if decoded and decoded not in ['.', '..']:
-                    return decoded
-        except:
-            pass
-        
-        # Strategy 4: Clean up null bytes and try UTF-8
+            self._preallocate(fd, length)
+            
+            # Linux: let the kernel move the data - no user-space copy at all
+            if self._kernel_copy_ok and hasattr(os, 'copy_file_range'):
+                if self._copy_extents_in_kernel(src_fd, fd, extents):
+                    return
+            
+            iso_mm = self._iso_mm
+            if iso_mm is not None:
+                # Slice file data straight out of the mapped ISO - no read() calls at all
+                mapped = memoryview(iso_mm)
+                try:
+                    for offset, size in extents:
+                        end = offset + size
+                        if end > len(mapped):
+                            raise Exception(f"Extent past end of ISO while extracting {local_path}")
+                        while offset < end:
+                            offset += os.write(fd, mapped[offset:min(end, offset + MMAP_WRITE_CHUNK)])
+                finally:
+                    mapped.release()
+                return
+            
+            view = self._transfer_view()
+            for offset, remaining in extents:
+                while remaining > 0:
+                    chunk = view[:min(remaining, len(view))]
+                    if hasattr(os, 'preadv'):
+                        read = os.preadv(src_fd, [chunk], offset)
+                    else:
+                        data = os.pread(src_fd, len(chunk), offset)
+                        read = len(data)
+                        chunk[:read] = data
+                    if read == 0:
+                        raise Exception(f"Unexpected end of ISO while extracting {local_path}")
+                    
+                    written = 0
+                    while written < read:
+                        written += os.write(fd, chunk[written:read])
+                    offset += read
+                    remaining -= read
+        finally:
+            os.close(fd)
+
+    def _copy_extents_in_kernel(self, src_fd, dst_fd, extents):
+        """Copy extents with copy_file_range(); False (and not retried) if the kernel refuses"""
+        dst_offset = 0
         try:
-            cleaned_bytes = raw_bytes.replace(b'\x00', b'')
-            decoded = cleaned_bytes.decode('utf-8', errors='ignore').strip()
-            if decoded and decoded not in ['.', '..']:
-                return decoded
-        except:
-            pass
+            for offset, remaining in extents:
+                while remaining > 0:
+                    copied = os.copy_file_range(src_fd, dst_fd, min(remaining, 1 << 30), offset, dst_offset)
+                    if copied == 0:
+                        raise Exception("Unexpected end of ISO during kernel copy")
+                    offset += copied
+                    dst_offset += copied
+                    remaining -= copied
+            return True
+        except OSError:
+            # e.g. EXDEV across filesystems on older kernels; explicit offsets leave the
+            # file position at 0, so the caller simply rewrites from the start
+            self._kernel_copy_ok = False
+            return False
+
+    def _preallocate(self, fd, length):
+        """Reserve disk space for a file about to be written, where the platform supports it"""
+        if not length:
+            return
+        if hasattr(os, 'posix_fallocate'):
+            try:
+                os.posix_fallocate(fd, 0, length)
+            except OSError:
+                pass  # Preallocation is only a hint (e.g. unsupported filesystem)
+        elif sys.platform == 'darwin':
+            # macOS has no posix_fallocate(); F_PREALLOCATE takes an fstore_t
+            # (flags, posmode, offset, length, bytesalloc) - values from <sys/fcntl.h>
+            import fcntl
+            import struct
+            F_PREALLOCATE = getattr(fcntl, 'F_PREALLOCATE', 42)
+            F_ALLOCATECONTIG, F_ALLOCATEALL, F_PEOFPOSMODE = 0x2, 0x4, 3
+            try:
+                try:
+                    fcntl.fcntl(fd, F_PREALLOCATE, struct.pack('Iiqqq', F_ALLOCATECONTIG | F_ALLOCATEALL, F_PEOFPOSMODE, 0, length, 0))
+                except OSError:
+                    # No single contiguous run free - any blocks will do
+                    fcntl.fcntl(fd, F_PREALLOCATE, struct.pack('Iiqqq', F_ALLOCATEALL, F_PEOFPOSMODE, 0, length, 0))
+                # F_PREALLOCATE reserves blocks without growing the file; match posix_fallocate()
+                os.ftruncate(fd, length)
+            except OSError:
+                pass
+
+    def _transfer_view(self):
+        """Return this thread's reusable transfer buffer"""
+        view = getattr(self._xfer_local, 'view', None)
+        if view is None:
+            view = self._xfer_local.view = memoryview(bytearray(EXTRACT_BUFFER_SIZE))
+        return view
+
+    def resolve_udf_name_getter(self, child):
+        """Probe a UDF entry for the filename accessor this pycdlib version provides.
         
-        # Strategy 5: Latin-1 fallback
-        try:
-            cleaned_bytes = raw_bytes.replace(b'\x00', b'')
-            decoded = cleaned_bytes.decode('latin-1', errors='ignore').strip()
-            if decoded and decoded not in ['.', '..']:
-                return decoded
-        except:
-            pass
+        Returns a callable taking a child entry, or None if no method yields a name.
+        """
+        def decode_text(value):
+            if isinstance(value, bytes):
+                return value.decode('utf-8', errors='ignore').strip()
+            return str(value)
         
-        # Strategy 6: Character-by-character extraction (for badly encoded UTF-16)
-        try:
-            # Extract every other byte (skip null bytes)
-            chars = []
-            for i in range(0, len(raw_bytes), 2):
-                if i < len(raw_bytes):
-                    byte_val = raw_bytes[i]
-                    if byte_val != 0 and 32 <= byte_val <= 126:  # Printable ASCII
-                        chars.append(chr(byte_val))
-            
-            decoded = ''.join(chars).strip()
-            if decoded and decoded not in ['.', '..']:
+        # Method 1: file_identifier()
+        def from_file_identifier(c):
+            return decode_text(c.file_identifier())
+        
+        # Method 2: raw UDF file identifier bytes
+        def from_fi_ident(c):
+            return self.decode_udf_filename(c.fi.fi_ident)
+        
+        # Method 3: identifier attribute
+        def from_identifier(c):
+            return decode_text(c.identifier)
+        
+        # Method 4: directory_record.identifier
+        def from_directory_record(c):
+            return decode_text(c.directory_record.identifier)
+        
+        for getter in (from_file_identifier, from_fi_ident, from_identifier, from_directory_record):
+            try:
+                if getter(child):
+                    return getter
+            except Exception:
+                continue
+        return None
+
+    def decode_udf_filename(self, raw_bytes):
+        """Decode UDF filename bytes (OSTA CS0), guessing only when the compression ID is missing"""
+        if not raw_bytes:
+            return ""
+        
+        # ECMA-167 d-strings start with a compression ID: 8 = one byte per character,
+        # 16 = UTF-16BE. That makes the decode deterministic for well-formed names
+        compression_id = raw_bytes[0]
+        if compression_id == 8:
+            decoded = bytes(raw_bytes[1:]).rstrip(b'\x00').decode('latin-1').strip()
+        elif compression_id == 16:
+            decoded = codecs.utf_16_be_decode(bytes(raw_bytes[1:]), 'ignore')[0].rstrip('\x00').strip()
+        else:
+            decoded = None
+        if decoded and decoded not in ['.', '..']:
+            return decoded
+        
+        return self._guess_udf_filename(bytes(raw_bytes))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _guess_udf_filename(raw_bytes):
+        """Decode filename bytes of unknown encoding with multiple strategies"""
+        def usable(decoded):
+            return decoded and decoded not in ['.', '..']
+        
+        # Null-free copy for the single-byte strategies; the UTF-16 ones need the pairing intact
+        cleaned_bytes = raw_bytes.translate(None, b'\x00')
+        
+        # Strategies 1-5, most to least likely: UTF-16LE (seen in non-conforming images),
+        # UTF-16BE, UTF-16LE after a stray leading zero byte, then UTF-8 and Latin-1
+        # without the nulls. errors='ignore' means none of them can raise
+        strategies = [('utf-16le', raw_bytes), ('utf-16be', raw_bytes)]
+        if len(raw_bytes) > 1 and raw_bytes[0] == 0 and len(raw_bytes) % 2 == 1:
+            strategies.append(('utf-16le', raw_bytes[1:]))
+        strategies += [('utf-8', cleaned_bytes), ('latin-1', cleaned_bytes)]
+        
+        for encoding, data in strategies:
+            decoded = data.decode(encoding, errors='ignore').replace('\x00', '').strip()
+            if usable(decoded):
                 return decoded
-        except:
-            pass
         
-        # Strategy 7: Try every other byte starting from position 1
-        try:
-            chars = []
-            for i in range(1, len(raw_bytes), 2):  # Start from position 1
-                if i < len(raw_bytes):
-                    byte_val = raw_bytes[i]
-                    if byte_val != 0 and 32 <= byte_val <= 126:  # Printable ASCII
-                        chars.append(chr(byte_val))
-            
-            decoded = ''.join(chars).strip()
-            if decoded and decoded not in ['.', '..']:
+        # Strategies 6 and 7: printable ASCII from every other byte (badly encoded UTF-16)
+        for start in (0, 1):
+            decoded = raw_bytes[start::2].translate(None, NONPRINTABLE_BYTES).decode('ascii').strip()
+            if usable(decoded):
                 return decoded
-        except:
-            pass
         
-        # Last resort: return hex representation
-        return raw_bytes.hex()
+        # Last resort: a bounded hex name - garbage descriptors can be far longer than NAME_MAX
+        return f"unknown_{raw_bytes[:16].hex()}"
 
     def extract_joliet_contents(self, iso, extract_dir):
         """Extract Joliet contents"""
         try:
             self.log("Trying Joliet extraction...")
-            files_extracted = 0
+            file_tasks = []
             
-            from collections import deque
             dirs_to_process = deque(['/'])
+            # Gather the tree during the walk and create it in one pass before any writes
+            dirs_needed = set()
             
             while dirs_to_process:
                 current_dir = dirs_to_process.popleft()
@@ -774,15 +1635,17 @@ If Boot Camp still doesn't recognize the ISO:
                     relative_path = current_dir.rstrip('/') + '/' + filename if current_dir != '/' else filename
                     local_path = extract_dir / relative_path.lstrip('/')
                     
+                    if self._minimal_extract and self.is_nonessential_path(relative_path, child.is_dir()):
+                        continue
+                    
                     if child.is_dir():
-                        local_path.mkdir(parents=True, exist_ok=True)
+                        dirs_needed.add(local_path)
                         dirs_to_process.append('/' + relative_path.lstrip('/') + '/')
                     else:
-                        local_path.parent.mkdir(parents=True, exist_ok=True)
-                        with open(local_path, 'wb') as f:
-                            iso.get_file_from_iso_fp(f, joliet_path='/' + relative_path.lstrip('/'))
-                        files_extracted += 1
+                        file_tasks.append(({'joliet_path': '/' + relative_path.lstrip('/')}, local_path, child))
             
+            self.create_extract_dirs(dirs_needed)
+            files_extracted = self.extract_file_tasks(iso, file_tasks)
             if files_extracted > 0:
                 self.log(f"✓ Successfully extracted {files_extracted} files using Joliet")
                 return True
@@ -796,17 +1659,21 @@ If Boot Camp still doesn't recognize the ISO:
         """Extract ISO 9660 contents"""
         try:
             self.log("Trying ISO 9660 extraction...")
-            files_extracted = 0
+            file_tasks = []
             
-            from collections import deque
             dirs_to_process = deque(['/'])
+            # Gather the tree during the walk and create it in one pass before any writes
+            dirs_needed = set()
             
             while dirs_to_process:
                 current_dir = dirs_to_process.popleft()
-                children_list = list(iso.list_children(iso_path=current_dir))
-                self.log(f"Processing {current_dir}: found {len(children_list)} entries")
+                # Stream the listing rather than materializing it - directories can hold thousands of entries
+                if self._verbose_extract:
+                    self.log(f"Processing {current_dir}")
+                entry_count = 0
                 
-                for i, child in enumerate(children_list):
+                for i, child in enumerate(iso.list_children(iso_path=current_dir)):
+                    entry_count += 1
                     try:
                         # Get filename using multiple methods
                         filename = None
@@ -826,7 +1693,8 @@ If Boot Camp still doesn't recognize the ISO:
                         if isinstance(filename, bytes):
                             filename = filename.decode('utf-8', errors='ignore').strip()
                         
-                        self.log(f"  Entry {i}: {filename} ({'DIR' if child.is_dir() else 'FILE'})")
+                        if self._verbose_extract:
+                            self.log(f"  Entry {i}: {filename} ({'DIR' if child.is_dir() else 'FILE'})")
                         
                         if not filename or filename in ['.', '..']:
                             continue
@@ -834,20 +1702,25 @@ If Boot Camp still doesn't recognize the ISO:
                         relative_path = current_dir.rstrip('/') + '/' + filename if current_dir != '/' else filename
                         local_path = extract_dir / relative_path.lstrip('/')
                         
+                        if self._minimal_extract and self.is_nonessential_path(relative_path, child.is_dir()):
+                            continue
+                        
                         if child.is_dir():
-                            local_path.mkdir(parents=True, exist_ok=True)
+                            dirs_needed.add(local_path)
                             dirs_to_process.append('/' + relative_path.lstrip('/') + '/')
                         else:
-                            local_path.parent.mkdir(parents=True, exist_ok=True)
-                            with open(local_path, 'wb') as f:
-                                iso.get_file_from_iso_fp(f, iso_path='/' + relative_path.lstrip('/'))
-                            files_extracted += 1
+                            file_tasks.append(({'iso_path': '/' + relative_path.lstrip('/')}, local_path, child))
                             
                     except Exception as e:
                         self.log(f"Warning: Error processing ISO 9660 entry {i}: {e}")
                         continue
+                
+                if self._verbose_extract:
+                    self.log(f"Processed {current_dir}: {entry_count} entries")
             
-            self.log(f"Extraction summary: {files_extracted} files, 0 directories")
+            dirs_created = self.create_extract_dirs(dirs_needed)
+            files_extracted = self.extract_file_tasks(iso, file_tasks)
+            self.log(f"Extraction summary: {files_extracted} files, {dirs_created} directories")
             if files_extracted > 0:
                 self.log(f"✓ Successfully extracted {files_extracted} files using ISO 9660")
             else:
@@ -873,33 +1746,31 @@ If Boot Camp still doesn't recognize the ISO:
                 self.log(f"✓ Found boot.wim at: {path}")
                 return path
         
-        # If not found, search recursively
-        self.log("Listing contents of extraction directory:")
-        for item in extract_dir.iterdir():
-            if item.is_file():
-                size = item.stat().st_size
-                self.log(f"  📄 {item.name} ({size:,} bytes)")
-            elif item.is_dir():
-                self.log(f"  📁 {item.name}/")
+        if self._verbose_extract:
+            self.log("Listing contents of extraction directory:")
+            with os.scandir(extract_dir) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        self.log(f"  📄 {entry.name} ({entry.stat().st_size:,} bytes)")
+                    elif entry.is_dir():
+                        self.log(f"  📁 {entry.name}/")
         
+        # If not found, search recursively - a single walk that also notes any other WIMs
         self.log("Performing recursive search for boot.wim...")
+        wim_files = []
         for root, dirs, files in os.walk(extract_dir):
             for file in files:
-                if file.lower() == "boot.wim":
+                # ISO 9660 extraction keeps the ';1' version suffix
+                name = file.lower().split(';')[0]
+                if name == "boot.wim":
                     boot_wim_path = Path(root) / file
                     self.log(f"✓ Found boot.wim at: {boot_wim_path}")
                     return boot_wim_path
+                if name.endswith('.wim'):
+                    wim_files.append(Path(root) / file)
         
-        # Final attempt - look for any WIM files
-        self.log("Searching for any WIM files...")
-        wim_files = []
-        for root, dirs, files in os.walk(extract_dir):
-            for file in files:
-                if file.lower().endswith('.wim'):
-                    wim_path = Path(root) / file
-                    wim_files.append(wim_path)
-                    self.log(f"Found WIM file: {wim_path}")
-        
+        for wim_path in wim_files:
+            self.log(f"Found WIM file: {wim_path}")
         if not wim_files:
             self.log("No WIM files found in the entire extraction")
         
@@ -910,27 +1781,45 @@ If Boot Camp still doesn't recognize the ISO:
         if current_depth >= max_depth:
             return
         
-        try:
-            indent = "  " * current_depth
-            for item in sorted(directory.iterdir()):
-                if item.is_file():
-                    size = item.stat().st_size
-                    self.log(f"{indent}📄 {item.name} ({size:,} bytes)")
-                elif item.is_dir():
-                    self.log(f"{indent}📁 {item.name}/")
-                    # Only recurse if we haven't hit max depth
-                    if current_depth < max_depth - 1:
-                        self.list_directory_structure(item, max_depth, current_depth + 1)
-        except Exception as e:
-            self.log(f"{indent}Error listing directory: {e}")
+        def listing(path, indent):
+            try:
+                with os.scandir(path) as it:
+                    entries = list(it)
+            except Exception as e:
+                self.log(f"{indent}Error listing directory: {e}")
+                return iter(())
+            # Sorting only pays off for directories small enough to read through
+            if len(entries) <= LISTING_SORT_LIMIT:
+                entries.sort(key=lambda entry: entry.name)
+            return iter(entries)
+        
+        # Explicit stack of (depth, entries) keeps the depth-first output order without recursing;
+        # DirEntry type checks come from readdir() and cost no extra stat
+        stack = [(current_depth, listing(directory, "  " * current_depth))]
+        while stack:
+            depth, entries = stack[-1]
+            entry = next(entries, None)
+            if entry is None:
+                stack.pop()
+                continue
+            
+            indent = "  " * depth
+            try:
+                if entry.is_file(follow_symlinks=False):
+                    size = entry.stat(follow_symlinks=False).st_size
+                    self.log(f"{indent}📄 {entry.name} ({size:,} bytes)")
+                elif entry.is_dir(follow_symlinks=False):
+                    self.log(f"{indent}📁 {entry.name}/")
+                    # Only descend if we haven't hit max depth
+                    if depth < max_depth - 1:
+                        stack.append((depth + 1, listing(entry.path, "  " * (depth + 1))))
+            except Exception as e:
+                self.log(f"{indent}Error listing directory: {e}")
 
     def add_tpm_bypass_to_boot_wim(self, boot_wim_path, temp_path):
         """Add TPM bypass to Windows 10 WinPE"""
         self.log("Adding TPM bypass to Windows 10 WinPE...")
         
-        wim_extract_dir = temp_path / "boot_wim_extract"
-        registry_script_path = temp_path / "tpm_bypass.txt"
-        
         try:
             # Validate boot.wim file exists
             if not boot_wim_path.exists():
@@ -949,15 +1838,17 @@ If Boot Camp still doesn't recognize the ISO:
                 self.log(f"Warning: Could not get boot.wim info: {info_result.stderr}")
                 image_index = '1'  # Default fallback
             else:
+                info_lines = info_result.stdout.splitlines()
                 self.log("boot.wim info:")
-                for line in info_result.stdout.split('\n')[:10]:  # Show first 10 lines
+                for line in info_lines[:10]:  # Show first 10 lines
                     if line.strip():
                         self.log(f"  {line}")
                 
                 # Look for image indices in the output
                 available_images = []
-                for line in info_result.stdout.split('\n'):
-                    if 'Index:' in line:
+                for line in info_lines:
+                    # Skip the header's "Boot Index:" line, which would list an image twice
+                    if line.strip().startswith('Index:'):
                         try:
                             idx = line.split('Index:')[1].strip()
                             available_images.append(idx)
@@ -971,91 +1862,54 @@ If Boot Camp still doesn't recognize the ISO:
                     image_index = '1'  # Default fallback
                     self.log("No image indices found, using default index 1")
             
-            # Create extraction directory
-            wim_extract_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Extract boot.wim
-            self.log(f"Extracting boot.wim image {image_index} for modification...")
+            # Only the SYSTEM hive changes, so pull just that file out of the image and
+            # swap it back with 'update' - no full image extraction or LZX recapture
+            hive_dir = temp_path / "boot_wim_hive"
+            hive_dir.mkdir(parents=True, exist_ok=True)
             
-            # Debug: Log the exact command being executed
-            extract_cmd = ['wimlib-imagex', 'extract', str(boot_wim_path), image_index, '--dest-dir=' + str(wim_extract_dir), '--no-acls']
+            self.log(f"Extracting SYSTEM hive from boot.wim image {image_index}...")
+            extract_cmd = ['wimlib-imagex', 'extract', str(boot_wim_path), image_index, SYSTEM_HIVE_WIM_PATH,
+                           '--dest-dir=' + str(hive_dir), '--no-acls']
             self.log(f"DEBUG: Executing command: {extract_cmd}")
-            
             extract_result = subprocess.run(extract_cmd, capture_output=True, text=True)
             
-            if extract_result.returncode != 0:
-                self.log(f"Extract failed with return code: {extract_result.returncode}")
-                self.log(f"Extract stdout: {extract_result.stdout}")
-                self.log(f"Extract stderr: {extract_result.stderr}")
-                raise Exception(f"Failed to extract boot.wim: {extract_result.stderr}")
-            
-            self.log(f"✓ Successfully extracted boot.wim image {image_index}")
-            
-            # Verify extraction worked
-            extracted_files = list(wim_extract_dir.rglob('*'))
-            self.log(f"Extracted {len(extracted_files)} files/directories")
-            
-            # Create registry script for TPM bypass
-            self.create_registry_script(registry_script_path)
-            
-            # Apply registry changes
-            self.log("Adding TPM bypass registry entries...")
-            system_hive = wim_extract_dir / "Windows" / "System32" / "config" / "SYSTEM"
-            
-            if system_hive.exists():
-                self.log(f"Found SYSTEM hive at: {system_hive}")
-                
-                # Create a temporary script for hivexsh commands
-                temp_script = temp_path / "hivex_script.txt"
-                with open(temp_script, 'w') as f:
-                    with open(registry_script_path, 'r') as reg_f:
-                        f.write(reg_f.read())
-                
-                registry_result = subprocess.run([
-                    'hivexsh', '-w', '-f', str(temp_script), str(system_hive)
-                ], capture_output=True, text=True)
-                
-                if registry_result.returncode != 0:
-                    self.log(f"Registry modification failed: {registry_result.stderr}")
-                    # Try alternative approach if first fails
-                    self.apply_registry_modifications_with_hivexsh(system_hive)
-                else:
-                    self.log("✓ Registry bypass entries added")
-                
-                # Clean up temporary script
-                if temp_script.exists():
-                    temp_script.unlink()
-            else:
+            system_hive = hive_dir / "SYSTEM"
+            if extract_result.returncode != 0 or not system_hive.exists():
                 self.log("Warning: SYSTEM registry hive not found, skipping TPM bypass")
-                self.log(f"Expected location: {system_hive}")
-                # List what we actually extracted
-                win_dir = wim_extract_dir / "Windows"
-                if win_dir.exists():
-                    sys32_dir = win_dir / "System32"
-                    if sys32_dir.exists():
-                        config_dir = sys32_dir / "config"
-                        if config_dir.exists():
-                            config_files = list(config_dir.iterdir())
-                            self.log(f"Found config files: {[f.name for f in config_files]}")
-                        else:
-                            self.log("config directory not found")
-                    else:
-                        self.log("System32 directory not found")
-                else:
-                    self.log("Windows directory not found")
-            
-            # Update boot.wim with modified contents
-            self.log("Updating boot.wim with TPM bypass...")
-            
-            # Debug: Log the exact capture command being executed
-            capture_cmd = ['wimlib-imagex', 'capture', str(wim_extract_dir), str(boot_wim_path), '--compress=LZX', '--check', '--boot']
-            self.log(f"DEBUG: Executing capture command: {capture_cmd}")
+                self.log(f"Expected location: {SYSTEM_HIVE_WIM_PATH} in image {image_index}")
+                if extract_result.stderr:
+                    self.log(f"Extract stderr: {extract_result.stderr}")
+                return
             
-            capture_result = subprocess.run(capture_cmd, capture_output=True, text=True)
+            # Apply registry changes
+            self.log("Adding TPM bypass registry entries...")
+            registry_result = self.run_hivexsh(system_hive, self._HIVEX_BYPASS_COMMANDS)
             
-            if capture_result.returncode != 0:
-                self.log(f"Capture failed: {capture_result.stderr}")
-                raise Exception(f"Failed to update boot.wim: {capture_result.stderr}")
+            if registry_result.returncode != 0:
+                self.log(f"Registry modification failed: {registry_result.stderr}")
+                # Try alternative approach if first fails
+                self.apply_registry_modifications_with_hivexsh(system_hive)
+            else:
+                self.log("✓ Registry bypass entries added")
+            
+            # Replace the hive inside the image in place
+            self.log(f"Updating boot.wim image {image_index} with TPM bypass...")
+            update_cmd = ['wimlib-imagex', 'update', str(boot_wim_path), image_index, '--check',
+                          f'--command=add "{system_hive}" "{SYSTEM_HIVE_WIM_PATH}"']
+            self.log(f"DEBUG: Executing update command: {update_cmd}")
+            update_result = subprocess.run(update_cmd, capture_output=True, text=True)
+            
+            if update_result.returncode != 0:
+                self.log(f"Update failed: {update_result.stderr}")
+                raise Exception(f"Failed to update boot.wim: {update_result.stderr}")
+            
+            # Recapturing used to leave the patched image as the WIM's only, bootable image;
+            # 'update' keeps the other images, so make the patched one the boot image
+            boot_result = subprocess.run(['wimlib-imagex', 'info', str(boot_wim_path), image_index, '--boot'],
+                                         capture_output=True, text=True)
+            if boot_result.returncode != 0:
+                self.log(f"Set boot image failed: {boot_result.stderr}")
+                raise Exception(f"Failed to mark boot.wim image {image_index} bootable: {boot_result.stderr}")
             
             self.log("✓ TPM bypass added to Windows 10 WinPE")
             
@@ -1080,15 +1934,12 @@ If Boot Camp still doesn't recognize the ISO:
         self.log(f"Forcing Windows 10 volume ID to: {forced_volume_id}")
 
         try:
-            iso = pycdlib.PyCdlib()
-            iso.open(win10_iso_path)
-
             # Get original volume ID for logging purposes, but use the forced one
-            original_volume_id = iso.pvd.volume_identifier.decode('utf-8').strip()
+            original_volume_id = self.get_iso_volume_id(win10_iso_path)
+            if original_volume_id is None:
+                raise Exception("could not read the volume ID")
             self.log(f"Original Windows 10 ISO volume ID: '{original_volume_id}'")
 
-            iso.close()
-
             metadata = {
                 'volume_id': forced_volume_id, # Use the forced volume ID
                 'application_id': 'Microsoft Windows',
@@ -1176,17 +2027,41 @@ If Boot Camp still doesn't recognize the ISO:
         if self.try_iso_creation_method("UDF mkisofs", udf_mkisofs_cmd, output_iso, source_size):
             return
         
+        # xorriso (e.g. from Homebrew) masters the tree in one C pass - far faster than
+        # adding files one by one through pycdlib
+        if self.check_command_available('xorriso'):
+            xorriso_cmd = [
+                'xorriso', '-as', 'mkisofs',
+                '-iso-level', '3',  # install.wim can exceed the 4 GiB single-extent limit
+                '-J', '-joliet-long', '-r',
+                '-V', volume_label,
+                '-o', str(output_iso),
+                str(source_dir)
+            ]
+            
+            if self.try_iso_creation_method("xorriso", xorriso_cmd, output_iso, source_size):
+                return
+        else:
+            self.log("xorriso not available, skipping...")
+        
         # Fallback to pycdlib with Boot Camp optimizations
         self.log("Using pycdlib with Boot Camp optimizations...")
         self.create_bootcamp_iso_with_pycdlib(source_dir, output_iso, volume_label)
 
     def check_command_available(self, command):
-        """Check if a command is available in the system"""
-        try:
-            result = subprocess.run([command, '--help'], capture_output=True, text=True, timeout=10)
-            return result.returncode == 0
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            return False
+        """Check if a command is available in the system (cached per process)"""
+        return find_command(command) is not None
+
+    def _tool_path(self, command):
+        """Absolute path of a command-line tool, or the bare name if it isn't on PATH"""
+        return find_command(command) or command
+
+    def run_tool(self, cmd, **kwargs):
+        """subprocess.run() for a command-line tool, spawned with posix_spawn() where possible"""
+        # CPython only takes its posix_spawn() path (no fork of the whole Tk process)
+        # for an absolute executable with close_fds=False; Python's own descriptors
+        # are non-inheritable, so nothing extra reaches the child
+        return subprocess.run([self._tool_path(cmd[0]), *cmd[1:]], close_fds=False, **kwargs)
 
     def try_iso_creation_method(self, method_name, cmd, output_iso, expected_size):
         """Try an ISO creation method and validate the result"""
@@ -1207,8 +2082,15 @@ If Boot Camp still doesn't recognize the ISO:
                         Path(output_iso).unlink()
                         return False
                     
-                    # macOS mounting test (critical for Boot Camp)
-                    if self.test_macos_iso_mounting(output_iso):
+                    # macOS mounting test (critical for Boot Camp) - a plain header read is
+                    # enough to rule out images hdiutil could never attach
+                    if not self.has_iso9660_signature(output_iso):
+                        self.log(f"❌ {method_name} output has no ISO 9660 volume descriptor, skipping mount test")
+                        mounted = False
+                    else:
+                        mounted = self.test_macos_iso_mounting(output_iso, check_files=True)
+                    
+                    if mounted:
                         self.log(f"✅ ISO created successfully with {method_name}")
                         return True
                     else:
@@ -1240,39 +2122,53 @@ If Boot Camp still doesn't recognize the ISO:
             self.log(f"{method_name} error: {e}")
             return False
 
+    def write_iso(self, iso, output_iso):
+        """Master a pycdlib ISO to output_iso, reserving its whole size on disk first"""
+        # pycdlib has already laid out every extent, so the final size is known exactly
+        with open(output_iso, 'wb') as f:
+            self._preallocate(f.fileno(), iso.pvd.space_size * iso.logical_block_size)
+            iso.write_fp(f)
+
+    def new_iso(self, volume_label, **new_kwargs):
+        """Start a new pycdlib ISO whose primary volume descriptor carries volume_label"""
+        iso = _pycdlib().PyCdlib()
+        # new() gives every descriptor the same label, but Joliet stores it as UCS-2 and
+        # rejects more than 16 characters; pass it the start and give the PVD, which
+        # Boot Camp reads, the whole label
+        iso.new(vol_ident=volume_label[:16], **new_kwargs)
+        iso.pvd.volume_identifier = volume_label[:32].ljust(32).encode('ascii')
+        return iso
+
     def create_bootcamp_iso_with_pycdlib(self, source_dir, output_iso, volume_label):
         """Create Boot Camp compatible ISO using pycdlib with improved path handling"""
         try:
             self.log("Initializing pycdlib for Boot Camp ISO...")
-            iso = pycdlib.PyCdlib()
-            
-            # Initialize with Rock Ridge and Joliet for maximum compatibility
-            iso.new(interchange_level=3, 
-                   joliet=3,
-                   rock_ridge='1.09',
-                   vol_ident=volume_label)
-            
-            # Add El Torito boot record for bootmgr
-            bootmgr_path = Path(source_dir) / "bootmgr"
-            if bootmgr_path.exists():
-                self.log("Adding El Torito boot record for bootmgr...")
-                iso.add_eltorito(str(bootmgr_path), "/BOOTMGR")
-            
-            # Add files recursively with improved path handling
-            self.log("Adding files to Boot Camp ISO with improved path handling...")
-            files_added = self.add_directory_to_iso_improved(iso, Path(source_dir), '/')
-            self.log(f"Total files added: {files_added}")
-            
-            if files_added == 0:
-                self.log("Warning: No files were added to ISO, trying minimal approach...")
-                # Try minimal approach
-                files_added = self.add_minimal_directory_to_iso(iso, Path(source_dir), '/')
-                self.log(f"Minimal files added: {files_added}")
-            
-            # Write the ISO
-            self.log("Writing Boot Camp ISO...")
-            iso.write(output_iso)
-            iso.close()
+            # Initialize with Rock Ridge and Joliet for maximum compatibility. new() runs
+            # before the try: closing an ISO it failed to set up would mask its error
+            iso = self.new_iso(volume_label, interchange_level=3, joliet=3, rock_ridge='1.09')
+            try:
+                # Add El Torito boot record for bootmgr
+                bootmgr_path = Path(source_dir) / "bootmgr"
+                if bootmgr_path.exists():
+                    self.log("Adding El Torito boot record for bootmgr...")
+                    iso.add_eltorito(str(bootmgr_path), "/BOOTMGR")
+                
+                # Add files recursively with improved path handling
+                self.log("Adding files to Boot Camp ISO with improved path handling...")
+                files_added = self.add_directory_to_iso_improved(iso, Path(source_dir), '/')
+                self.log(f"Total files added: {files_added}")
+                
+                if files_added == 0:
+                    self.log("Warning: No files were added to ISO, trying minimal approach...")
+                    # Try minimal approach
+                    files_added = self.add_minimal_directory_to_iso(iso, Path(source_dir), '/')
+                    self.log(f"Minimal files added: {files_added}")
+                
+                # Write the ISO
+                self.log("Writing Boot Camp ISO...")
+                self.write_iso(iso, output_iso)
+            finally:
+                iso.close()
             
             # Validate size
             if Path(output_iso).exists():
@@ -1280,7 +2176,7 @@ If Boot Camp still doesn't recognize the ISO:
                 self.log(f"pycdlib Boot Camp ISO size: {output_size:,} bytes ({output_size / (1024**3):.2f} GB)")
                 
                 # Test mounting
-                if self.test_macos_iso_mounting(output_iso):
+                if self.test_macos_iso_mounting(output_iso, check_files=True):
                     self.log("✅ Boot Camp ISO created successfully with pycdlib")
                     return
                 else:
@@ -1295,61 +2191,88 @@ If Boot Camp still doesn't recognize the ISO:
             # Final fallback
             self.create_simple_iso_fallback(source_dir, output_iso, volume_label)
 
+    def _iter_files(self, root):
+        """Yield (absolute path, '/'-separated relative path) strings for every regular file under root"""
+        # os.scandir() hands back the entry type from readdir(), so unlike rglob() + is_file()
+        # this neither stats every entry nor builds a Path object for it
+        def scan(dir_path, rel_prefix):
+            dirs, files = [], []
+            try:
+                with os.scandir(dir_path) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            dirs.append((entry.path, rel_prefix + entry.name + '/'))
+                        elif entry.is_file(follow_symlinks=False):
+                            files.append((entry.path, rel_prefix + entry.name))
+            except OSError as e:
+                # Skip unreadable directories and keep walking, as rglob() did
+                if self._verbose_extract:
+                    self.log(f"Warning: Skipping unreadable directory {dir_path}: {e}")
+                return [], []
+            return dirs, files
+        
+        # Walk serially in sorted order: readdir() order varies between filesystems and
+        # runs, and the ISO layout (and so the output bytes) follows the order yielded here
+        stack = [(os.fspath(root), '')]
+        while stack:
+            dirs, files = scan(*stack.pop())
+            yield from sorted(files)
+            stack.extend(sorted(dirs, reverse=True))
+
     def add_directory_to_iso_improved(self, iso, source_path, iso_path):
         """Add directory contents to ISO with improved path handling to avoid 'Input string too long!'"""
         files_added = 0
-        skipped_files = 0
+        skipped = Counter()
+        
+        # Hoisted out of the per-file loop
+        add_file = iso.add_file
+        log = self.log
+        verbose = self._verbose_extract
+        max_path = 100  # Very strict path length limit for pycdlib (100 chars to be safe)
+        max_name = 50
+        next_progress = time.monotonic() + PROGRESS_LOG_INTERVAL
         
         try:
-            for item in source_path.rglob('*'):
-                if item.is_file():
-                    # Create ISO path with very strict length limits
-                    relative_path = item.relative_to(source_path)
-                    # Fix: Move the replace operation outside the f-string
-                    relative_path_str = str(relative_path).replace('\\', '/')
-                    iso_file_path = f"{iso_path}{relative_path_str}"
-                    
-                    # Very strict path length limits for pycdlib (100 chars to be safe)
-                    if len(iso_file_path) > 100:
-                        self.log(f"Warning: Skipping file with path too long: {iso_file_path}")
-                        skipped_files += 1
-                        continue
-                    
-                    # Check for problematic characters and sequences
-                    problematic_chars = ['\x00', '\x01', '\x02', '\x03', '\x04', '\x05', '\x06', '\x07', '\x08', '\x09', '\x0a', '\x0b', '\x0c', '\x0d', '\x0e', '\x0f']
-                    if any(char in iso_file_path for char in problematic_chars):
-                        self.log(f"Warning: Skipping file with problematic characters: {iso_file_path}")
-                        skipped_files += 1
-                        continue
-                    
-                    # Check for non-ASCII characters that might cause issues
-                    try:
-                        iso_file_path.encode('ascii')
-                    except UnicodeEncodeError:
-                        self.log(f"Warning: Skipping file with non-ASCII characters: {iso_file_path}")
-                        skipped_files += 1
-                        continue
-                    
-                    # Additional safety check for very long filenames
-                    if len(item.name) > 50:
-                        self.log(f"Warning: Skipping file with very long name: {item.name}")
-                        skipped_files += 1
-                        continue
-                    
-                    try:
-                        iso.add_file(str(item), iso_file_path)
-                        files_added += 1
-                        if files_added % 50 == 0:  # More frequent logging
-                            self.log(f"Added {files_added} files to ISO...")
-                    except Exception as e:
-                        self.log(f"Warning: Failed to add file {iso_file_path}: {e}")
-                        skipped_files += 1
-                        continue
+            for file_path, relative_path in self._iter_files(source_path):
+                # Create ISO path with very strict length limits
+                iso_file_path = iso_path + relative_path
+                
+                if len(iso_file_path) > max_path:
+                    reason = "path too long"
+                # Only printable ASCII is safe here - two C-level scans cover both the control
+                # characters and anything non-ASCII, with no per-character loop or encode()
+                elif not (iso_file_path.isascii() and iso_file_path.isprintable()):
+                    reason = "problematic or non-ASCII characters"
+                # Additional safety check for very long filenames
+                elif len(relative_path.rpartition('/')[2]) > max_name:
+                    reason = "very long name"
+                else:
+                    reason = None
+                
+                if reason is not None:
+                    # Tallied for one summary line; per-file detail only in verbose mode
+                    skipped[reason] += 1
+                    if verbose:
+                        log(f"Warning: Skipping file with {reason}: {iso_file_path}")
+                    continue
+                
+                try:
+                    add_file(file_path, iso_file_path)
+                    files_added += 1
+                    # Progress on a clock rather than every N files
+                    if time.monotonic() >= next_progress:
+                        log(f"Added {files_added} files to ISO...")
+                        next_progress = time.monotonic() + PROGRESS_LOG_INTERVAL
+                except Exception as e:
+                    log(f"Warning: Failed to add file {iso_file_path}: {e}")
+                    skipped["add failures"] += 1
+                    continue
         except Exception as e:
-            self.log(f"Error adding directory to ISO: {e}")
+            log(f"Error adding directory to ISO: {e}")
         
-        if skipped_files > 0:
-            self.log(f"Warning: Skipped {skipped_files} files due to path length or character issues")
+        if skipped:
+            details = ', '.join(f"{count} {reason}" for reason, count in skipped.most_common())
+            log(f"Warning: Skipped {sum(skipped.values())} files due to path length or character issues ({details})")
         
         return files_added
 
@@ -1357,43 +2280,47 @@ If Boot Camp still doesn't recognize the ISO:
         """Final fallback - create basic ISO with minimal files"""
         try:
             self.log("Creating basic fallback ISO with minimal files...")
-            iso = pycdlib.PyCdlib()
-            iso.new(joliet=3, vol_ident=volume_label)
-            
-            # Only add essential files to avoid path length issues
-            essential_files = [
-                'bootmgr', 'setup.exe', 'boot/bootmgr', 'sources/boot.wim', 'sources/install.wim', 'sources/setup.exe'
-            ]
-            
-            files_added = 0
-            for file_name in essential_files:
-                file_path = Path(source_dir) / file_name
-                if file_path.exists():
+            iso = self.new_iso(volume_label, joliet=3)
+            try:
+                # Only add essential files to avoid path length issues
+                essential_files = [
+                    'bootmgr', 'setup.exe', 'boot/bootmgr', 'sources/boot.wim', 'sources/install.wim', 'sources/setup.exe'
+                ]
+                
+                source_path = Path(source_dir)
+                files_added = 0
+                for file_name in essential_files:
+                    # add_file() stats the file itself, so a missing one just raises - no exists() first
                     try:
-                        iso.add_file(str(file_path), f"/{file_name}")
+                        iso.add_file(str(source_path / file_name), f"/{file_name}")
                         files_added += 1
                         self.log(f"Added essential file: {file_name}")
+                    except FileNotFoundError:
+                        continue
                     except Exception as e:
                         self.log(f"Warning: Failed to add essential file {file_name}: {e}")
+                
+                # Add a few more critical directories if they exist
+                critical_dirs = ['boot', 'sources', 'efi']
+                for dir_name in critical_dirs:
+                    dir_path = source_path / dir_name
+                    if dir_path.exists():
+                        try:
+                            files_in_dir = self.add_minimal_directory_to_iso(iso, dir_path, f"/{dir_name}")
+                            files_added += files_in_dir
+                            self.log(f"Added {files_in_dir} files from {dir_name}/")
+                        except Exception as e:
+                            self.log(f"Warning: Failed to add directory {dir_name}: {e}")
+                
+                self.write_iso(iso, output_iso)
+            finally:
+                iso.close()
             
-            # Add a few more critical directories if they exist
-            critical_dirs = ['boot', 'sources', 'efi']
-            for dir_name in critical_dirs:
-                dir_path = Path(source_dir) / dir_name
-                if dir_path.exists():
-                    try:
-                        files_in_dir = self.add_minimal_directory_to_iso(iso, dir_path, f"/{dir_name}")
-                        files_added += files_in_dir
-                        self.log(f"Added {files_in_dir} files from {dir_name}/")
-                    except Exception as e:
-                        self.log(f"Warning: Failed to add directory {dir_name}: {e}")
-            
-            iso.write(output_iso)
-            iso.close()
-            
-            if Path(output_iso).exists():
-                output_size = Path(output_iso).stat().st_size
+            try:
+                output_size = os.stat(output_iso).st_size
                 self.log(f"Fallback ISO size: {output_size:,} bytes ({output_size / (1024**3):.2f} GB)")
+            except FileNotFoundError:
+                pass
             
             self.log(f"✅ Fallback ISO created with {files_added} files")
             
@@ -1405,21 +2332,20 @@ If Boot Camp still doesn't recognize the ISO:
         """Add minimal directory contents to avoid path length issues"""
         files_added = 0
         try:
-            for item in source_path.rglob('*'):
-                if item.is_file():
-                    # Create very short ISO path
-                    relative_path = item.relative_to(source_path)
-                    iso_file_path = f"{iso_path}/{item.name}"  # Just use filename
-                    
-                    # Skip if still too long
-                    if len(iso_file_path) > 64:
-                        continue
-                    
-                    try:
-                        iso.add_file(str(item), iso_file_path)
-                        files_added += 1
-                    except Exception as e:
-                        continue
+            for file_path, relative_path in self._iter_files(source_path):
+                # Create very short ISO path
+                file_name = relative_path.rpartition('/')[2]
+                iso_file_path = f"{iso_path}/{file_name}"  # Just use filename
+                
+                # Skip if still too long
+                if len(iso_file_path) > 64:
+                    continue
+                
+                try:
+                    iso.add_file(file_path, iso_file_path)
+                    files_added += 1
+                except Exception as e:
+                    continue
         except Exception as e:
             self.log(f"Error adding minimal directory: {e}")
         return files_added
@@ -1427,38 +2353,45 @@ If Boot Camp still doesn't recognize the ISO:
     def calculate_directory_size(self, directory):
         """Calculate the total size of a directory"""
         total_size = 0
-        for dirpath, dirnames, filenames in os.walk(directory):
-            for filename in filenames:
-                filepath = os.path.join(dirpath, filename)
-                if os.path.isfile(filepath):
-                    total_size += os.path.getsize(filepath)
+        # One stat per file: DirEntry types come from readdir() and stat() is cached on the entry
+        stack = [str(directory)]
+        while stack:
+            try:
+                it = os.scandir(stack.pop())
+            except OSError:
+                continue  # Unreadable directory - os.walk() skipped these silently too
+            with it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total_size += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
         return total_size
 
     def add_directory_to_iso(self, iso, source_path, iso_path):
         """Add directory contents to ISO with proper path handling"""
         files_added = 0
         try:
-            for item in source_path.rglob('*'):
-                if item.is_file():
-                    # Create ISO path
-                    relative_path = item.relative_to(source_path)
-                    # Fix: Move the replace operation outside the f-string
-                    relative_path_str = str(relative_path).replace('\\', '/')
-                    iso_file_path = f"{iso_path}{relative_path_str}"
-                    
-                    # Ensure path doesn't exceed ISO 9660 limits
-                    if len(iso_file_path) > 255:
-                        self.log(f"Warning: Skipping file with path too long: {iso_file_path}")
-                        continue
-                    
-                    try:
-                        iso.add_file(str(item), iso_file_path)
-                        files_added += 1
-                        if files_added % 100 == 0:
-                            self.log(f"Added {files_added} files to ISO...")
-                    except Exception as e:
-                        self.log(f"Warning: Failed to add file {iso_file_path}: {e}")
-                        continue
+            for file_path, relative_path in self._iter_files(source_path):
+                # Create ISO path
+                iso_file_path = iso_path + relative_path
+                
+                # Ensure path doesn't exceed ISO 9660 limits
+                if len(iso_file_path) > 255:
+                    self.log(f"Warning: Skipping file with path too long: {iso_file_path}")
+                    continue
+                
+                try:
+                    iso.add_file(file_path, iso_file_path)
+                    files_added += 1
+                    if files_added % 100 == 0:
+                        self.log(f"Added {files_added} files to ISO...")
+                except Exception as e:
+                    self.log(f"Warning: Failed to add file {iso_file_path}: {e}")
+                    continue
         except Exception as e:
             self.log(f"Error adding directory to ISO: {e}")
         return files_added
@@ -1467,45 +2400,96 @@ If Boot Camp still doesn't recognize the ISO:
         """Add files to ISO with simplified path handling"""
         files_added = 0
         try:
-            for item in source_path.rglob('*'):
-                if item.is_file():
-                    # Create simplified ISO path
-                    relative_path = item.relative_to(source_path)
-                    # Fix: Move the replace operation outside the f-string
-                    relative_path_str = str(relative_path).replace('\\', '/')
-                    iso_file_path = f"{iso_path}{relative_path_str}"
-                    
-                    # Truncate path if too long
-                    if len(iso_file_path) > 200:  # Conservative limit
-                        self.log(f"Warning: Truncating long path: {iso_file_path}")
-                        # Keep only the filename
-                        iso_file_path = f"{iso_path}{item.name}"
-                    
-                    try:
-                        iso.add_file(str(item), iso_file_path)
-                        files_added += 1
-                        if files_added % 50 == 0:
-                            self.log(f"Added {files_added} files to fallback ISO...")
-                    except Exception as e:
-                        self.log(f"Warning: Failed to add file to fallback ISO: {e}")
-                        continue
+            for file_path, relative_path in self._iter_files(source_path):
+                # Create simplified ISO path
+                iso_file_path = iso_path + relative_path
+                
+                # Truncate path if too long
+                if len(iso_file_path) > 200:  # Conservative limit
+                    self.log(f"Warning: Truncating long path: {iso_file_path}")
+                    # Keep only the filename
+                    iso_file_path = f"{iso_path}{relative_path.rpartition('/')[2]}"
+                
+                try:
+                    iso.add_file(file_path, iso_file_path)
+                    files_added += 1
+                    if files_added % 50 == 0:
+                        self.log(f"Added {files_added} files to fallback ISO...")
+                except Exception as e:
+                    self.log(f"Warning: Failed to add file to fallback ISO: {e}")
+                    continue
         except Exception as e:
             self.log(f"Error adding files to fallback ISO: {e}")
         return files_added
 
+    def _open_iso(self, iso_path):
+        """Return a pycdlib handle on iso_path, shared by the validation checks until _close_iso()"""
+        st = os.stat(iso_path)
+        key = (os.path.abspath(iso_path), st.st_mtime_ns, st.st_size)
+        if self._cached_iso_key != key:
+            self._close_iso()
+            iso = _pycdlib().PyCdlib()
+            iso.open(iso_path)
+            self._cached_iso, self._cached_iso_key = iso, key
+        return self._cached_iso
+
+    def _close_iso(self):
+        """Close the handle cached by _open_iso() and drop what was cached with it"""
+        if self._cached_iso is not None:
+            try:
+                self._cached_iso.close()
+            except Exception:
+                pass
+        self._cached_iso = self._cached_iso_key = self._cached_iso_root = self._cached_iso_files = None
+        self._cached_iso_header = None
+
+    def _enumerate_root(self, iso):
+        """List the ISO 9660 root directory once per cached handle"""
+        if iso is not self._cached_iso:
+            return list(iso.list_children(iso_path='/'))
+        if self._cached_iso_root is None:
+            self._cached_iso_root = list(iso.list_children(iso_path='/'))
+        return self._cached_iso_root
+
+    def _enumerate_files(self, iso):
+        """Set of lower-cased relative paths of every file in the ISO, walked once per cached handle"""
+        if iso is self._cached_iso and self._cached_iso_files is not None:
+            return self._cached_iso_files
+        
+        # Walk the richest namespace - Windows ISOs keep their real tree in UDF,
+        # the ISO 9660 side is often just a README stub
+        if hasattr(iso, 'udf_anchors') and iso.udf_anchors:
+            path_key = 'udf_path'
+        elif iso.joliet_vd:
+            path_key = 'joliet_path'
+        else:
+            path_key = 'iso_path'
+        available_files = set()
+        try:
+            for root, dirs, files in iso.walk(**{path_key: '/'}):
+                for file in files:
+                    if path_key == 'iso_path':
+                        file = file.split(';')[0].rstrip('.')
+                    available_files.add((root.rstrip('/') + '/' + file).lstrip('/').lower())
+                    if self._verbose_extract:
+                        self.log(f"  {path_key.split('_')[0].upper()} file: {root.rstrip('/')}/{file}")
+        except Exception as e:
+            self.log(f"  Error walking {path_key.split('_')[0].upper()} tree: {e}")
+        
+        if iso is self._cached_iso:
+            self._cached_iso_files = available_files
+        return available_files
+
     def validate_iso_structure(self, iso_path):
         """Validate basic ISO structure"""
         try:
-            iso = pycdlib.PyCdlib()
-            iso.open(iso_path)
+            iso = self._open_iso(iso_path)
             
             # Check if ISO has basic structure
             has_files = False
-            for child in iso.list_children(iso_path='/'):
+            for child in self._enumerate_root(iso):
                 has_files = True
                 break
-            
-            iso.close()
             return has_files
         except Exception as e:
             self.log(f"ISO structure validation failed: {e}")
@@ -1521,73 +2505,27 @@ If Boot Camp still doesn't recognize the ISO:
         self.log(f"🔍 Checking for essential files: {', '.join(essential_files)}")
         
         try:
-            iso = pycdlib.PyCdlib()
-            iso.open(iso_path)
+            iso = self._open_iso(iso_path)
             
             # Debug: List all files in the ISO root
             self.log("🔍 Debug: Listing all files in ISO root:")
             try:
-                for child in iso.list_children(iso_path='/'):
+                for child in self._enumerate_root(iso):
                     self.log(f"  - {child.file_identifier()}")
             except Exception as e:
                 self.log(f"  Error listing files: {e}")
             
-            # Collect all available paths for checking
-            available_files = []
-            try:
-                # Check UDF paths
-                for root, dirs, files in iso.walk(udf=True):
-                    for file in files:
-                        available_files.append(file)
-                        self.log(f"  UDF file: {file}")
-            except Exception as e:
-                self.log(f"  Error walking UDF: {e}")
-            
-            try:
-                # Check ISO paths
-                for child in iso.list_children(iso_path='/'):
-                    available_files.append(child.file_identifier())
-                    self.log(f"  ISO file: {child.file_identifier()}")
-            except Exception as e:
-                self.log(f"  Error listing ISO files: {e}")
+            available_files = self._enumerate_files(iso)
             
             # Check each essential file
             for file_path in essential_files:
-                # Check if file exists in any of the available paths
-                file_found = False
-                
-                # Check exact match
                 if file_path in available_files:
                     found_files.append(file_path)
                     self.log(f"✅ Found: {file_path}")
-                    file_found = True
                 else:
-                    # Check if it's a file within a directory (e.g., sources/boot.wim)
-                    path_parts = file_path.split('/')
-                    if len(path_parts) > 1:
-                        # For files in subdirectories, check if the directory and file exist
-                        dir_name = path_parts[0]
-                        file_name = path_parts[1]
-                        
-                        # Look for the directory first
-                        if dir_name in available_files:
-                            # Check if the file exists in that directory
-                            try:
-                                for child in iso.list_children(iso_path=f"/{dir_name}"):
-                                    if child.file_identifier() == file_name:
-                                        found_files.append(file_path)
-                                        self.log(f"✅ Found: {file_path}")
-                                        file_found = True
-                                        break
-                            except Exception as e:
-                                self.log(f"  Error checking directory {dir_name}: {e}")
-                
-                if not file_found:
                     missing_files.append(file_path)
                     self.log(f"❌ Missing: {file_path}")
             
-            iso.close()
-            
             # Log summary
             self.log(f"📊 Essential files summary: {len(found_files)}/{len(essential_files)} found")
             if missing_files:
@@ -1599,127 +2537,86 @@ If Boot Camp still doesn't recognize the ISO:
             self.log(f"Essential files check failed: {e}")
             return False
 
+    def _read_iso_header(self, iso_path):
+        """Return the ISO's first volume descriptor sector (from 0x8000), read once per file version"""
+        # The volume ID and boot signature checks both slice this one pread(); the
+        # cache is keyed like _open_iso()'s so a rewritten ISO is read again
+        st = os.stat(iso_path)
+        key = (os.path.abspath(iso_path), st.st_mtime_ns, st.st_size)
+        if self._cached_iso_header is None or self._cached_iso_header[0] != key:
+            fd = os.open(iso_path, os.O_RDONLY)
+            try:
+                self._cached_iso_header = (key, os.pread(fd, 2048, 0x8000))
+            finally:
+                os.close(fd)
+        return self._cached_iso_header[1]
+
     def get_iso_volume_id(self, iso_path):
         """Get ISO volume identifier"""
+        # Read it straight out of the primary volume descriptor (sector 16, bytes 40-71)
+        # rather than having pycdlib parse the whole descriptor set and path tables
         try:
-            iso = pycdlib.PyCdlib()
-            iso.open(iso_path)
-            vol_id = iso.get_volume_ident()
-            iso.close()
-            return vol_id
+            pvd = self._read_iso_header(iso_path)[:72]
+            if pvd[:7] != b'\x01CD001\x01':
+                raise Exception("no ISO 9660 primary volume descriptor")
+            # d-characters only, space padded on the right
+            return pvd[40:72].decode('ascii', errors='replace').rstrip()
         except Exception as e:
             self.log(f"Volume ID check failed: {e}")
             return None
 
     def check_wim_files(self, iso_path):
         """Check for WIM files in the ISO"""
-        wim_files = []
         try:
-            iso = pycdlib.PyCdlib()
-            iso.open(iso_path)
+            iso = self._open_iso(iso_path)
             
-            for child in iso.list_children(iso_path='/'):
-                if child.file_identifier().endswith('.wim'):
-                    wim_files.append(child.file_identifier())
-            
-            iso.close()
+            # Answered from the file walk the essential-files check already made
+            wim_files = [path for path in self._enumerate_files(iso) if path.endswith('.wim')]
             return len(wim_files) > 0
         except Exception as e:
             self.log(f"WIM files check failed: {e}")
             return False
 
+    def has_iso9660_signature(self, iso_path):
+        """Check for the ISO 9660 primary volume descriptor at sector 16"""
+        try:
+            # Same cached sector read as the volume ID and boot signature checks
+            return self._read_iso_header(iso_path)[:7] == b'\x01CD001\x01'  # Type 1 (primary), version 1
+        except Exception as e:
+            self.log(f"ISO 9660 signature check failed: {e}")
+            return False
+
     def check_bootable_signature(self, iso_path):
         """Check if ISO has bootable signature"""
         try:
-            with open(iso_path, 'rb') as f:
-                # Check for El Torito boot signature
-                f.seek(0x8000)  # Boot sector location
-                boot_sector = f.read(512)
-                return boot_sector[510:512] == b'\x55\xaa'  # Boot signature
+            # Check for El Torito boot signature - the last two bytes of the
+            # 512-byte boot sector at 0x8000, out of the shared header read
+            return self._read_iso_header(iso_path)[510:512] == b'\x55\xaa'  # Boot signature
         except Exception as e:
             self.log(f"Boot signature check failed: {e}")
             return False
 
-    def create_registry_script(self, script_path):
-        """Create a registry script to add the bypass keys"""
-        # Create hivexsh interactive commands
-        hivexsh_commands = [
-            "cd \\Setup",
-            "ls",  # List to see if LabConfig exists
-            "add LabConfig",  # This will fail if it exists, but that's OK
-            "cd LabConfig",
-            "setval 2",
-            "BypassTPMCheck",
-            "dword:1",
-            "BypassSecureBootCheck", 
-            "dword:1",
-            "commit",
-            "quit"
-        ]
-        with open(script_path, 'w') as f:
-            f.write('\n'.join(hivexsh_commands) + '\n')
+    def run_hivexsh(self, hive_path, commands):
+        """Run hivexsh commands against a hive, fed on stdin rather than through a script file"""
+        return subprocess.run(['hivexsh', '-w', str(hive_path)], input='\n'.join(commands) + '\n',
+                              capture_output=True, text=True)
     
     def apply_registry_modifications_with_hivexsh(self, system_hive_path):
         """Apply registry modifications using hivexsh"""
         # First, try to navigate to the Setup key and create LabConfig if it doesn't exist
         self.log("Checking and creating registry structure...")
+        result = self.run_hivexsh(system_hive_path, self._HIVEX_BYPASS_COMMANDS)
         
-        # Create a temporary script file for hivexsh commands
-        temp_script = system_hive_path.parent / "hivex_script.txt"
+        # Check if it failed due to LabConfig already existing
+        if result.returncode != 0 and "already exists" in result.stderr:
+            self.log("LabConfig key already exists, updating values...")
+            # Try again without creating the key
+            result = self.run_hivexsh(system_hive_path, self._HIVEX_UPDATE_COMMANDS)
         
-        try:
-            # Create the hivexsh commands
-            hivexsh_commands = [
-                "cd \\Setup",
-                "ls",  # List to see if LabConfig exists
-                "add LabConfig",  # This will fail if it exists, but that's OK
-                "cd LabConfig",
-                "setval 2",
-                "BypassTPMCheck",
-                "dword:1",
-                "BypassSecureBootCheck", 
-                "dword:1",
-                "commit",
-                "quit"
-            ]
-            
-            # Write commands to temporary script file
-            with open(temp_script, 'w') as f:
-                f.write('\n'.join(hivexsh_commands) + '\n')
-            
-            # Execute hivexsh with the script file and hive file
-            cmd = ['hivexsh', '-w', '-f', str(temp_script), str(system_hive_path)]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            # Check if it failed due to LabConfig already existing
-            if result.returncode != 0 and "already exists" in result.stderr:
-                self.log("LabConfig key already exists, updating values...")
-                # Try again without creating the key
-                hivexsh_commands_update = [
-                    "cd \\Setup\\LabConfig",
-                    "setval 2",
-                    "BypassTPMCheck",
-                    "dword:1",
-                    "BypassSecureBootCheck", 
-                    "dword:1",
-                    "commit",
-                    "quit"
-                ]
-                
-                with open(temp_script, 'w') as f:
-                    f.write('\n'.join(hivexsh_commands_update) + '\n')
-                
-                result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if result.returncode != 0:
-                raise Exception(f"Failed to apply registry modifications with hivexsh: {result.stderr}")
-            
-            self.log("Registry modifications applied using hivexsh")
-            
-        finally:
-            # Clean up temporary script file
-            if temp_script.exists():
-                temp_script.unlink()
+        if result.returncode != 0:
+            raise Exception(f"Failed to apply registry modifications with hivexsh: {result.stderr}")
+        
+        self.log("Registry modifications applied using hivexsh")
     
     def modify_version_files(self, iso_extract_dir, win10_metadata):
         """Modify any version-related files in the ISO"""
@@ -1747,8 +2644,8 @@ If Boot Camp still doesn't recognize the ISO:
         except Exception as e:
             self.log(f"Warning: Error checking version files: {e}")
 
-    def test_macos_iso_mounting(self, iso_path):
-        """Test if the ISO can be mounted by macOS using hdiutil"""
+    def test_macos_iso_mounting(self, iso_path, check_files=False):
+        """Test if the ISO can be mounted by macOS using hdiutil, optionally checking its essential files"""
         self.log("Testing macOS ISO mounting compatibility...")
         
         try:
@@ -1761,36 +2658,17 @@ If Boot Camp still doesn't recognize the ISO:
                 return False
             
             # Extract mount point from output
-            mount_point = None
-            for line in result.stdout.split('\n'):
-                if '/dev/disk' in line and '/Volumes/' in line:
-                    parts = line.split()
-                    for part in parts:
-                        if part.startswith('/Volumes/'):
-                            mount_point = part
-                            break
-                    if mount_point:
-                        break
-            
-            if not mount_point:
+            match = HDIUTIL_MOUNT_POINT_RE.search(result.stdout)
+            if not match:
                 self.log("❌ Could not determine mount point from hdiutil output")
                 return False
+            mount_point = match.group(1).rstrip()
             
             self.log(f"✅ ISO mounted successfully at: {mount_point}")
             
-            # Check for essential files in mounted ISO
-            essential_files = ['bootmgr', 'setup.exe', 'sources/boot.wim', 'sources/install.wim']
-            missing_files = []
-            
-            for file_path in essential_files:
-                full_path = os.path.join(mount_point, file_path)
-                if not os.path.exists(full_path):
-                    missing_files.append(file_path)
-            
-            if missing_files:
-                self.log(f"⚠️ Missing essential files in mounted ISO: {missing_files}")
-            else:
-                self.log("✅ All essential files found in mounted ISO")
+            # Validation already checked the files through pycdlib; freshly built images haven't been
+            if check_files:
+                self._check_essentials_on_mounted_iso(mount_point)
             
             # Unmount the ISO
             unmount_result = subprocess.run(['hdiutil', 'detach', mount_point], 
@@ -1817,6 +2695,17 @@ If Boot Camp still doesn't recognize the ISO:
             self.log(f"❌ macOS mounting test failed: {str(e)}")
             return False
 
+    def _check_essentials_on_mounted_iso(self, mount_point):
+        """Log which essential installer files are missing from a mounted ISO"""
+        essential_files = ['bootmgr', 'setup.exe', 'sources/boot.wim', 'sources/install.wim']
+        missing_files = [file_path for file_path in essential_files
+                         if not os.path.exists(os.path.join(mount_point, file_path))]
+        
+        if missing_files:
+            self.log(f"⚠️ Missing essential files in mounted ISO: {missing_files}")
+        else:
+            self.log("✅ All essential files found in mounted ISO")
+
     def validate_bootcamp_iso(self, iso_path):
         """Comprehensive validation of the generated ISO for Boot Camp compatibility"""
         self.log("🔍 Performing comprehensive Boot Camp validation...")
@@ -1832,46 +2721,50 @@ If Boot Camp still doesn't recognize the ISO:
         if size_gb < 1.0:
             self.log("⚠️ Warning: ISO file size is very small, may be incomplete")
         
-        # Enhanced ISO analysis for Boot Camp debugging
-        self.log("🔍 Performing detailed ISO analysis for Boot Camp compatibility...")
-        self.analyze_iso_for_bootcamp(iso_path)
-        
-        # Validate ISO structure
-        self.log("🔍 Validating ISO structure...")
-        if not self.validate_iso_structure(iso_path):
-            raise Exception("ISO structure validation failed")
-        
-        # Check essential Windows files
-        self.log("🔍 Checking essential Windows files...")
-        if not self.check_essential_windows_files(iso_path):
-            raise Exception("Essential Windows files missing")
-        
-        # Get and validate volume ID
-        self.log("🔍 Checking volume ID...")
-        volume_id = self.get_iso_volume_id(iso_path)
-        if not volume_id:
-            self.log("⚠️ Warning: Could not determine volume ID")
-        else:
-            self.log(f"📋 Volume ID: {volume_id}")
-        
-        # Check WIM files
-        self.log("🔍 Checking WIM files...")
-        if not self.check_wim_files(iso_path):
-            raise Exception("Required WIM files missing")
-        
-        # Check bootable signature
-        self.log("🔍 Checking bootable signature...")
-        if not self.check_bootable_signature(iso_path):
-            self.log("⚠️ Warning: ISO may not be bootable")
-        
-        # Test macOS mounting
-        self.log("🔍 Testing macOS mounting compatibility...")
-        if not self.test_macos_iso_mounting(iso_path):
-            self.log("⚠️ Warning: ISO may not be compatible with macOS mounting")
-        
-        # Boot Camp specific checks
-        self.log("🔍 Performing Boot Camp specific checks...")
-        self.perform_bootcamp_specific_checks(iso_path)
+        # The checks below share a single pycdlib parse of the ISO
+        try:
+            # Enhanced ISO analysis for Boot Camp debugging
+            self.log("🔍 Performing detailed ISO analysis for Boot Camp compatibility...")
+            self.analyze_iso_for_bootcamp(iso_path)
+            
+            # Validate ISO structure
+            self.log("🔍 Validating ISO structure...")
+            if not self.validate_iso_structure(iso_path):
+                raise Exception("ISO structure validation failed")
+            
+            # Check essential Windows files
+            self.log("🔍 Checking essential Windows files...")
+            if not self.check_essential_windows_files(iso_path):
+                raise Exception("Essential Windows files missing")
+            
+            # Get and validate volume ID
+            self.log("🔍 Checking volume ID...")
+            volume_id = self.get_iso_volume_id(iso_path)
+            if not volume_id:
+                self.log("⚠️ Warning: Could not determine volume ID")
+            else:
+                self.log(f"📋 Volume ID: {volume_id}")
+            
+            # Check WIM files
+            self.log("🔍 Checking WIM files...")
+            if not self.check_wim_files(iso_path):
+                raise Exception("Required WIM files missing")
+            
+            # Check bootable signature
+            self.log("🔍 Checking bootable signature...")
+            if not self.check_bootable_signature(iso_path):
+                self.log("⚠️ Warning: ISO may not be bootable")
+            
+            # Test macOS mounting
+            self.log("🔍 Testing macOS mounting compatibility...")
+            if not self.test_macos_iso_mounting(iso_path):
+                self.log("⚠️ Warning: ISO may not be compatible with macOS mounting")
+            
+            # Boot Camp specific checks
+            self.log("🔍 Performing Boot Camp specific checks...")
+            self.perform_bootcamp_specific_checks(iso_path)
+        finally:
+            self._close_iso()
         
         self.log("✅ Boot Camp validation completed successfully!")
         return True
@@ -1889,16 +2782,15 @@ If Boot Camp still doesn't recognize the ISO:
     def analyze_iso_for_bootcamp(self, iso_path):
         """Detailed analysis of ISO for Boot Camp compatibility debugging"""
         try:
-            iso = pycdlib.PyCdlib()
-            iso.open(iso_path)
+            iso = self._open_iso(iso_path)
             
             self.log("📊 Detailed ISO Analysis for Boot Camp:")
             
             # Check ISO format
             self.log(f"  - ISO Level: {iso.interchange_level}")
-            self.log(f"  - Joliet: {'Yes' if iso.joliet_vd() else 'No'}")
+            self.log(f"  - Joliet: {'Yes' if iso.joliet_vd is not None else 'No'}")
             self.log(f"  - Rock Ridge: {'Yes' if iso.rock_ridge else 'No'}")
-            self.log(f"  - UDF: {'Yes' if iso.udf_vd() else 'No'}")
+            self.log(f"  - UDF: {'Yes' if iso.has_udf() else 'No'}")
             
             # Check boot sectors
             try:
@@ -1912,9 +2804,9 @@ If Boot Camp still doesn't recognize the ISO:
             try:
                 pvd = iso.pvd
                 self.log(f"  - Primary Volume Descriptor: Present")
-                self.log(f"  - Volume ID: {pvd.volume_ident.decode('utf-8').strip()}")
-                self.log(f"  - Application ID: {pvd.application_ident.decode('utf-8').strip()}")
-                self.log(f"  - Publisher ID: {pvd.publisher_ident.decode('utf-8').strip()}")
+                self.log(f"  - Volume ID: {pvd.volume_identifier.decode('ascii', errors='replace').rstrip()}")
+                self.log(f"  - Application ID: {pvd.application_identifier.text.decode('ascii', errors='replace').rstrip()}")
+                self.log(f"  - Publisher ID: {pvd.publisher_identifier.text.decode('ascii', errors='replace').rstrip()}")
             except:
                 self.log("  - Primary Volume Descriptor: Error reading")
             
@@ -1930,36 +2822,19 @@ If Boot Camp still doesn't recognize the ISO:
             ]
             
             self.log("  - Essential Boot Camp Files:")
+            # One walk shared with the essential-files check instead of a failing lookup per guess
+            available_files = self._enumerate_files(iso)
             for file_path in essential_bootcamp_files:
-                try:
-                    # Try different path formats
-                    found = False
-                    for path_format in [f"/{file_path}", file_path, f"\\{file_path}"]:
-                        try:
-                            if path_format.startswith('/'):
-                                iso.get_file_from_iso(udf_path=path_format)
-                            else:
-                                iso.get_file_from_iso(iso_path=path_format)
-                            self.log(f"    ✅ {file_path}")
-                            found = True
-                            break
-                        except:
-                            continue
-                    if not found:
-                        self.log(f"    ❌ {file_path}")
-                except Exception as e:
-                    self.log(f"    ❌ {file_path} (Error: {e})")
+                self.log(f"    {'✅' if file_path in available_files else '❌'} {file_path}")
             
             # Check directory structure
             self.log("  - Root Directory Contents:")
             try:
-                for child in iso.list_children(iso_path='/'):
+                for child in self._enumerate_root(iso):
                     self.log(f"    - {child.file_identifier()}")
             except Exception as e:
                 self.log(f"    Error listing root contents: {e}")
             
-            iso.close()
-            
         except Exception as e:
             self.log(f"❌ Error analyzing ISO: {e}")
 
@@ -1969,8 +2844,7 @@ If Boot Camp still doesn't recognize the ISO:
         
         # Check for Windows 10 compatibility indicators
         try:
-            iso = pycdlib.PyCdlib()
-            iso.open(iso_path)
+            iso = self._open_iso(iso_path)
             
             # Check for Windows 10 version files
             version_files = [
@@ -1978,32 +2852,23 @@ If Boot Camp still doesn't recognize the ISO:
                 'sources/install.wim'
             ]
             
+            # Same single walk as the other validation checks
+            available_files = self._enumerate_files(iso)
             for version_file in version_files:
-                try:
-                    # Extract and check WIM file version info
-                    temp_dir = tempfile.mkdtemp()
-                    try:
-                        iso.get_file_from_iso(udf_path=f"/{version_file}")
-                        # This is a simplified check - in a real implementation we'd extract and analyze the WIM
-                        self.log(f"  ✅ {version_file} present")
-                    except:
-                        self.log(f"  ❌ {version_file} missing")
-                    finally:
-                        shutil.rmtree(temp_dir, ignore_errors=True)
-                except Exception as e:
-                    self.log(f"  ❌ Error checking {version_file}: {e}")
+                # This is a simplified check - in a real implementation we'd extract and analyze the WIM
+                if version_file in available_files:
+                    self.log(f"  ✅ {version_file} present")
+                else:
+                    self.log(f"  ❌ {version_file} missing")
             
             # Check for proper boot configuration
             boot_files = ['bootmgr', 'boot/bootmgr']
             for boot_file in boot_files:
-                try:
-                    iso.get_file_from_iso(udf_path=f"/{boot_file}")
+                if boot_file in available_files:
                     self.log(f"  ✅ {boot_file} present")
-                except:
+                else:
                     self.log(f"  ❌ {boot_file} missing")
             
-            iso.close()
-            
         except Exception as e:
             self.log(f"❌ Error in Boot Camp specific checks: {e}")
         
@@ -2029,55 +2894,67 @@ If Boot Camp still doesn't recognize the ISO:
         self.log("     - Try copying the ISO to a different location")
         self.log("     - Ensure the ISO file has proper permissions")
 
-    def debug_bootcamp_issues(self, iso_path):
+    def debug_bootcamp_issues(self, iso_path, hash_iso=False, stat_info=None):
         """Provide detailed debugging information for Boot Camp issues"""
         self.log("🔍 Boot Camp Issue Debugging:")
         
-        # Check file permissions
+        # Check file permissions (callers that already stat'ed the ISO pass the result)
         try:
-            stat_info = os.stat(iso_path)
-            self.log(f"  - File permissions: {oct(stat_info.st_mode)[-3:]}")
+            if stat_info is None:
+                stat_info = os.stat(iso_path)
+            self.log(f"  - File permissions: {stat_info.st_mode & 0o777:03o}")
             self.log(f"  - File owner: {stat_info.st_uid}")
             self.log(f"  - File size: {stat_info.st_size:,} bytes")
         except Exception as e:
             self.log(f"  - Error checking file info: {e}")
         
-        # Check if file is accessible
-        try:
-            with open(iso_path, 'rb') as f:
-                f.read(1024)  # Read first 1KB
+        # Check if file is accessible - access() answers that without opening the file
+        if os.access(iso_path, os.R_OK):
             self.log("  - File is readable")
-        except Exception as e:
-            self.log(f"  - File access error: {e}")
+        else:
+            self.log("  - File access error: not readable by this user")
+        
+        if hash_iso:
+            try:
+                # Comparable with the hashes Microsoft publishes for its ISOs
+                with open(iso_path, 'rb') as f:
+                    if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+                        digest = hashlib.file_digest(f, 'sha256')
+                    else:
+                        digest = hashlib.sha256()
+                        for chunk in iter(functools.partial(f.read, EXTRACT_BUFFER_SIZE), b''):
+                            digest.update(chunk)
+                self.log(f"  - SHA-256: {digest.hexdigest()}")
+            except Exception as e:
+                self.log(f"  - File access error: {e}")
         
         # Test manual mounting
         self.log("  - Testing manual ISO mounting...")
         try:
-            result = subprocess.run(['hdiutil', 'attach', '-readonly', '-nobrowse', iso_path], 
-                                  capture_output=True, text=True, timeout=30)
+            result = self.run_tool(['hdiutil', 'attach', '-readonly', '-nobrowse', iso_path], 
+                                   capture_output=True, text=True, timeout=30)
             if result.returncode == 0:
                 self.log("  - Manual mounting successful")
-                # Extract mount point
-                for line in result.stdout.split('\n'):
-                    if '/Volumes/' in line:
-                        mount_point = line.split()[-1]
-                        self.log(f"  - Mounted at: {mount_point}")
-                        # List contents
-                        try:
-                            ls_result = subprocess.run(['ls', '-la', mount_point], 
-                                                     capture_output=True, text=True, timeout=10)
-                            if ls_result.returncode == 0:
-                                self.log("  - Mounted contents:")
-                                for content_line in ls_result.stdout.split('\n')[:10]:  # First 10 lines
-                                    if content_line.strip():
-                                        self.log(f"    {content_line}")
-                        except Exception as e:
-                            self.log(f"  - Error listing mounted contents: {e}")
-                        
-                        # Unmount
-                        subprocess.run(['hdiutil', 'detach', mount_point], 
-                                     capture_output=True, timeout=10)
-                        break
+                # Extract mount point (the whole tab-separated column, names may contain spaces)
+                match = HDIUTIL_MOUNT_POINT_RE.search(result.stdout)
+                if match:
+                    mount_point = match.group(1).rstrip()
+                    self.log(f"  - Mounted at: {mount_point}")
+                    # List contents
+                    try:
+                        # Listed in-process rather than forking ls and parsing its output
+                        with os.scandir(mount_point) as it:
+                            entries = list(itertools.islice(it, 10))  # First 10 entries
+                        self.log("  - Mounted contents:")
+                        for entry in entries:
+                            st = entry.stat(follow_symlinks=False)
+                            self.log(f"    {stat.filemode(st.st_mode)} {st.st_size:>12,} {entry.name}")
+                    except Exception as e:
+                        self.log(f"  - Error listing mounted contents: {e}")
+                    
+                    # Unmount
+                    self.run_tool(['hdiutil', 'detach', mount_point], 
+                                  capture_output=True, timeout=10)
             else:
                 self.log(f"  - Manual mounting failed: {result.stderr}")
         except Exception as e:
@@ -2122,16 +2999,47 @@ If Boot Camp still doesn't recognize the ISO:
             self.log("❌ No output ISO path specified")
             return
         
-        if not os.path.exists(output_iso):
+        try:
+            stat_info = os.stat(output_iso)
+        except FileNotFoundError:
             self.log("❌ Output ISO file does not exist")
             return
         
+        if self._debug_thread is not None and self._debug_thread.is_alive():
+            self.log("⚠️ Boot Camp debugging is already running")
+            return
+        
+        if self._label_thread is not None and self._label_thread.is_alive():
+            self.log("⚠️ Wait for the volume label update to finish before debugging")
+            return
+        
         self.log("🔍 Starting Boot Camp issue debugging...")
         self.log(f"📁 Analyzing ISO: {output_iso}")
         
+        # hdiutil can take up to 30s and hashing reads the whole ISO, so keep both off the
+        # Tk main loop; log() only queues lines and is safe to call from the thread
+        self._debug_thread = threading.Thread(target=self._debug_iso_worker,
+                                              args=(output_iso, self.debug_hash_iso.get(), stat_info),
+                                              daemon=True)
+        self._debug_thread.start()
+
+    def _debug_iso_busy(self):
+        """True, after telling the user, while a debugger or label-forcing thread is using the output ISO"""
+        if self._debug_thread is not None and self._debug_thread.is_alive():
+            messagebox.showwarning("Boot Camp Debugging Running",
+                                   "The output ISO is still being debugged. Wait for debugging to finish first.")
+            return True
+        if self._label_thread is not None and self._label_thread.is_alive():
+            messagebox.showwarning("Volume Label Update Running",
+                                   "The output ISO's volume label is still being updated. Wait for that to finish first.")
+            return True
+        return False
+
+    def _debug_iso_worker(self, output_iso, hash_iso, stat_info):
+        """Background half of debug_current_iso"""
         # Run comprehensive debugging
         try:
-            self.debug_bootcamp_issues(output_iso)
+            self.debug_bootcamp_issues(output_iso, hash_iso=hash_iso, stat_info=stat_info)
             self.log("✅ Boot Camp debugging completed")
         except Exception as e:
             self.log(f"❌ Error during debugging: {e}")
@@ -2146,6 +3054,9 @@ If Boot Camp still doesn't recognize the ISO:
 
     def force_current_iso_volume_label(self):
         """Force the current output ISO to have the correct Boot Camp volume label"""
+        if self._debug_iso_busy():
+            return
+        
         output_iso = self.output_iso_path.get()
         
         if not output_iso:
@@ -2159,6 +3070,15 @@ If Boot Camp still doesn't recognize the ISO:
         self.log("🔧 Forcing Boot Camp volume label...")
         self.log(f"📁 Target ISO: {output_iso}")
         
+        # The fallback extracts and rebuilds the whole ISO, so run it off the Tk main loop
+        # like debug_current_iso; the dialogs wait for the thread in _poll_label_thread
+        self._label_result = None
+        self._label_thread = threading.Thread(target=self._force_label_worker, args=(output_iso,), daemon=True)
+        self._label_thread.start()
+        self.root.after(WORKER_POLL_INTERVAL_MS, self._poll_label_thread)
+
+    def _force_label_worker(self, output_iso):
+        """Background half of force_current_iso_volume_label; leaves the dialog to show in _label_result"""
         # First analyze the current volume label
         current_volume_label = self.analyze_iso_volume_label(output_iso)
         
@@ -2170,39 +3090,43 @@ If Boot Camp still doesn't recognize the ISO:
         try:
             if self.force_bootcamp_volume_label(output_iso):
                 self.log("✅ Successfully updated volume label for Boot Camp compatibility")
-                messagebox.showinfo("Success", "Volume label updated successfully!")
+                self._label_result = ('info', "Volume label updated successfully!")
             else:
                 self.log("❌ Failed to update volume label")
-                messagebox.showerror("Error", "Failed to update volume label")
+                self._label_result = ('error', "Failed to update volume label")
         except Exception as e:
             self.log(f"❌ Error updating volume label: {e}")
-            messagebox.showerror("Error", f"Error updating volume label: {e}")
+            self._label_result = ('error', f"Error updating volume label: {e}")
+
+    def _poll_label_thread(self):
+        """Show the label-forcing result once its thread finishes (Tk dialogs need the main thread)"""
+        if self._label_thread.is_alive():
+            self.root.after(WORKER_POLL_INTERVAL_MS, self._poll_label_thread)
+            return
+        
+        if self._label_result is None:
+            return
+        kind, message = self._label_result
+        if kind == 'info':
+            messagebox.showinfo("Success", message)
+        else:
+            messagebox.showerror("Error", message)
 
     def analyze_iso_volume_label(self, iso_path):
         """Analyze the volume label of an ISO file"""
         try:
-            iso = pycdlib.PyCdlib()
-            iso.open(iso_path)
-            
             # Get volume ID from PVD
-            volume_id = iso.pvd.volume_identifier.decode('utf-8').strip()
+            volume_id = self.get_iso_volume_id(iso_path)
+            if volume_id is None:
+                return None
             self.log(f"Current ISO volume label: '{volume_id}'")
             
             # Check if it matches expected Boot Camp format
-            expected_patterns = [
-                'CCCOMA_X64FRE_EN-US_DV9',
-                'CCCOMA_X64FRE_EN-US_DV9%202',
-                'CCCOMA_X64FRE_EN-US_DV9%203'
-            ]
-            
-            for pattern in expected_patterns:
-                if volume_id == pattern:
-                    self.log(f"✅ Volume label matches expected Boot Camp pattern: {pattern}")
-                    iso.close()
-                    return volume_id
+            if volume_id in BOOTCAMP_VOLUME_IDS:
+                self.log(f"✅ Volume label matches expected Boot Camp pattern: {volume_id}")
+                return volume_id
             
             self.log(f"⚠️ Volume label '{volume_id}' doesn't match expected Boot Camp patterns")
-            iso.close()
             return volume_id
             
         except Exception as e:
@@ -2213,6 +3137,25 @@ If Boot Camp still doesn't recognize the ISO:
         """Force the volume label to match what Boot Camp expects"""
         self.log(f"Attempting to force volume label to: {target_volume_label}")
         
+        # Only the volume descriptors hold the label, so rewrite those in place and
+        # keep the extract-and-rebuild path for images that can't be patched
+        try:
+            iso = _pycdlib().PyCdlib()
+            iso.open(iso_path, 'r+b')
+            try:
+                self.write_volume_label_in_place(iso, target_volume_label)
+            finally:
+                iso.close()
+                # Don't let a later check reuse a handle or header from before the rewrite
+                self._close_iso()
+            new_volume_label = self.analyze_iso_volume_label(iso_path)
+            if new_volume_label == target_volume_label:
+                self.log("✅ Successfully updated volume label")
+                return True
+            self.log(f"⚠️ In-place volume label update failed. Current: '{new_volume_label}', rebuilding ISO")
+        except Exception as e:
+            self.log(f"In-place volume label update failed ({e}), rebuilding ISO")
+        
         try:
             # Create a temporary directory for the ISO contents
             with tempfile.TemporaryDirectory() as temp_dir:
@@ -2220,7 +3163,8 @@ If Boot Camp still doesn't recognize the ISO:
                 self.log("Extracting ISO contents for volume label modification...")
                 self.extract_iso_contents(iso_path, temp_dir)
                 
-                # Remove the original ISO
+                # Remove the original ISO, dropping any handle or header cached for it
+                self._close_iso()
                 Path(iso_path).unlink()
                 
                 # Recreate the ISO with the correct volume label
@@ -2246,6 +3190,57 @@ If Boot Camp still doesn't recognize the ISO:
             self.log(f"Error forcing Boot Camp volume label: {e}")
             return False
 
+class PatchWorker(Win11BootCampPatcher):
+    """Headless patcher run in the worker process; log/status go back to the UI over queues"""
+    
+    def __init__(self, config, log_queue, progress_queue):
+        self._log_queue = log_queue
+        self._progress_queue = progress_queue
+        self._init_state()
+        self._verbose_extract = config['verbose_extract']
+        self._minimal_extract = config['minimal_extract']
+        self._log_buffer = []
+        self._log_lock = threading.Lock()
+        # Lines logged just before a long subprocess call still reach the UI promptly
+        threading.Thread(target=self._flush_log_periodically, daemon=True).start()
+    
+    def log(self, message):
+        """Buffer message for the UI log; one queue put per batch instead of per line"""
+        with self._log_lock:
+            self._log_buffer.append(message)
+            if len(self._log_buffer) < WORKER_LOG_BATCH:
+                return
+        self.flush_log()
+    
+    def flush_log(self, limit=None):
+        """Send buffered log lines to the UI as a single batch"""
+        with self._log_lock:
+            lines, self._log_buffer = self._log_buffer, []
+            if lines:
+                self._log_queue.put(lines)
+    
+    def _flush_log_periodically(self):
+        """Worker-side counterpart of the UI's log drain"""
+        while True:
+            time.sleep(WORKER_POLL_INTERVAL_MS / 1000)
+            self.flush_log()
+    
+    def update_status(self, status):
+        """Send status bar text to the UI"""
+        # Keep the status in step with the log lines that led up to it
+        self.flush_log()
+        self._progress_queue.put(('status', status))
+
+def _do_patch(config, log_queue, progress_queue):
+    """Worker process entry point for Win11BootCampPatcher.start_patching"""
+    worker = PatchWorker(config, log_queue, progress_queue)
+    try:
+        result = ('done', worker.patch_iso(config))
+    except Exception as e:
+        result = ('error', str(e))
+    worker.flush_log()
+    progress_queue.put(result)
+
 def main():
     print("=== Windows 11 Boot Camp ISO Patcher ===")
     print("Starting application...")
@@ -2258,6 +3253,8 @@ def main():
         print("  pip install pycdlib")
         return
     
+    import_tkinter()
+    
     try:
         print("Creating Tkinter root...")
         root = tk.Tk()
@@ -2284,4 +3281,5 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main() 
\ No newline at end of file
@@ -106,5 +106,49 @@ def test_iso_tools():
         print("- If only pycdlib works: ISOs may work but might have bootability issues")
         print("- If both fail: You need to install missing dependencies")
 
+def test_in_place_patch_udf_only_boot_wim():
+    """Test that boot.wim is patched in place when only the UDF tree has it"""
+    print("\n🔧 Testing in-place boot.wim patch on a UDF bridge image")
+    print("=" * 40)
+    
+    import io
+    import pycdlib
+    from main import Win11BootCampPatcher
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        
+        # Like retail Windows media: the ISO 9660 side holds only a README stub
+        iso = pycdlib.PyCdlib()
+        iso.new(interchange_level=3, udf='2.60', vol_ident='WIN11')
+        readme = b"This disc contains a UDF file system"
+        iso.add_fp(io.BytesIO(readme), len(readme), '/README.TXT;1', udf_path='/readme.txt')
+        iso.add_directory(udf_path='/sources')
+        old_wim = os.urandom(10000)
+        iso.add_fp(io.BytesIO(old_wim), len(old_wim), udf_path='/sources/boot.wim')
+        iso.write(str(temp_path / "win11.iso"))
+        iso.close()
+        
+        new_wim = os.urandom(9000)
+        (temp_path / "boot.wim").write_bytes(new_wim)
+        
+        patcher = Win11BootCampPatcher.__new__(Win11BootCampPatcher)
+        patcher.log = print
+        output_iso = temp_path / "output.iso"
+        assert patcher.patch_iso_in_place(str(temp_path / "win11.iso"), str(temp_path / "boot.wim"),
+                                          str(output_iso), {'volume_id': 'CCCOMA_X64FRE_EN-US_DV9'})
+        
+        iso = pycdlib.PyCdlib()
+        iso.open(str(output_iso))
+        try:
+            patched = io.BytesIO()
+            iso.get_file_from_iso_fp(patched, udf_path='/sources/boot.wim')
+            assert patched.getvalue() == new_wim
+            assert iso.pvd.volume_identifier.rstrip() == b'CCCOMA_X64FRE_EN-US_DV9'
+        finally:
+            iso.close()
+        print("✅ boot.wim replaced in place through the UDF record")
+
 if __name__ == "__main__":
     test_iso_tools()
+    test_in_place_patch_udf_only_boot_wim()